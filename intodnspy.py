@@ -5,6 +5,7 @@ import asyncio
 import contextlib
 import json
 import logging
+import math
 import os
 import signal
 import socket
@@ -17,6 +18,7 @@ from typing import Dict, List, Tuple, Optional
 
 import dns.resolver
 import aiohttp
+import jinja2
 from aiohttp import web
 
 # Optional uvloop for performance (skips on Windows if not installed)
@@ -24,6 +26,12 @@ with contextlib.suppress(Exception):
     import uvloop
     asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
+# Optional orjson for faster dashboard JSON (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 LOG = logging.getLogger("dns_uptimer_ai")
 logging.basicConfig(
     level=logging.INFO,
@@ -34,17 +42,16 @@ logging.basicConfig(
 @dataclass
 class LatencyStats:
     samples: deque = field(default_factory=lambda: deque(maxlen=200))
-    ema: Optional[float] = None
+    ema: float = math.nan
     alpha: float = 0.25  # EMA smoothing
     last_anomaly: Optional[str] = None
     last_anomaly_ts: Optional[float] = None
 
     def add(self, value: float):
         self.samples.append(value)
-        if self.ema is None:
-            self.ema = value
-        else:
-            self.ema = self.alpha * value + (1 - self.alpha) * self.ema
+        e = self.ema
+        # NaN != NaN: seeds the EMA on the first sample without a None check
+        self.ema = value if e != e else self.alpha * value + (1 - self.alpha) * e
 
     def zscore(self, value: float) -> float:
         if len(self.samples) < 10:
@@ -67,21 +74,25 @@ class LatencyStats:
             "count": len(self.samples),
             "median_ms": round(median, 2),
             "p95_ms": round(p95, 2),
-            "ema_ms": round(self.ema or median, 2)
+            "ema_ms": round(median if math.isnan(self.ema) else self.ema, 2)
         }
 
 @dataclass
 class UptimeStats:
     window: int = 200
-    results: deque = field(default_factory=lambda: deque(maxlen=200))
+    # Rolling window as a bitmask: bit 0 is the newest result, 1 = success
+    bits: int = 0
+    count: int = 0
 
     def add(self, success: bool):
-        self.results.append(1 if success else 0)
+        self.bits = ((self.bits << 1) | int(success)) & ((1 << self.window) - 1)
+        if self.count < self.window:
+            self.count += 1
 
     def ratio(self) -> float:
-        if not self.results:
+        if not self.count:
             return 0.0
-        return sum(self.results) / len(self.results)
+        return self.bits.bit_count() / self.count
 
 class DNSUptimerAI:
     def __init__(self,
@@ -156,7 +167,7 @@ class DNSUptimerAI:
         # AI-ish anomaly logic
         anomaly = None
         if not ok:
-            if upt < 0.95 and len(self.uptime[key].results) >= 20:
+            if upt < 0.95 and self.uptime[key].count >= 20:
                 anomaly = f"Repeated failures: uptime {upt:.2%}"
             else:
                 anomaly = "Single failure"
@@ -205,59 +216,60 @@ class DNSUptimerAI:
         return {"targets": out, "generated_at": time.time()}
 
 # --- Web dashboard ---
-def make_app(monitor: DNSUptimerAI) -> web.Application:
-    app = web.Application()
-
-    async def json_status(request):
-        return web.json_response(monitor.snapshot())
-
-    async def html_status(request):
-        snap = monitor.snapshot()
-        # Minimal HTML for quick glance
-        rows = []
-        for target, entries in snap["targets"].items():
-            for e in entries:
-                color = "#26a269" if e["ok"] else "#c01c28"
-                rows.append(f"""
-<tr>
-  <td>{target}</td>
-  <td>{e['resolver']}</td>
-  <td>{e['rtype']}</td>
-  <td style="color:{color};font-weight:600">{'OK' if e['ok'] else 'FAIL'}</td>
-  <td>{e['latency_ms']} ms</td>
-  <td>{e['uptime_window_ratio']*100:.2f}%</td>
-  <td>{e['latency_summary'].get('median_ms','-')} / {e['latency_summary'].get('p95_ms','-')} / {e['latency_summary'].get('ema_ms','-')} ms</td>
-  <td>{e.get('last_anomaly','')}</td>
-</tr>
-""")
-        html = f"""<!doctype html>
+# Compiled once at import; autoescape keeps target names and errors inert
+_STATUS_TEMPLATE = jinja2.Environment(autoescape=True).from_string("""<!doctype html>
 <html>
 <head>
 <meta charset="utf-8" />
 <title>AI DNS Uptime</title>
 <style>
-body {{ font-family: system-ui, Segoe UI, sans-serif; margin: 24px; }}
-table {{ border-collapse: collapse; width: 100%; }}
-th, td {{ border: 1px solid #ddd; padding: 8px; font-size: 14px; }}
-th {{ background: #f4f4f4; text-align: left; }}
-caption {{ text-align:left; font-weight:700; margin-bottom:8px; }}
+body { font-family: system-ui, Segoe UI, sans-serif; margin: 24px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ddd; padding: 8px; font-size: 14px; }
+th { background: #f4f4f4; text-align: left; }
+caption { text-align:left; font-weight:700; margin-bottom:8px; }
 </style>
 </head>
 <body>
 <caption>AI DNS Uptime Checker</caption>
-<p>Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
+<p>Generated: {{ generated }}</p>
 <table>
 <thead><tr>
 <th>Target</th><th>Resolver</th><th>Type</th><th>Status</th><th>Latency</th><th>Uptime</th><th>Median/P95/EMA</th><th>Anomaly</th>
 </tr></thead>
 <tbody>
-{''.join(rows) or '<tr><td colspan="8">No data yet...</td></tr>'}
+{% for target, entries in snap.targets.items() if entries %}{% for e in entries %}
+<tr>
+  <td>{{ target }}</td>
+  <td>{{ e.resolver }}</td>
+  <td>{{ e.rtype }}</td>
+  <td style="color:{{ '#26a269' if e.ok else '#c01c28' }};font-weight:600">{{ 'OK' if e.ok else 'FAIL' }}</td>
+  <td>{{ e.latency_ms }} ms</td>
+  <td>{{ '%.2f' % (e.uptime_window_ratio * 100) }}%</td>
+  <td>{{ e.latency_summary.get('median_ms', '-') }} / {{ e.latency_summary.get('p95_ms', '-') }} / {{ e.latency_summary.get('ema_ms', '-') }} ms</td>
+  <td>{{ e.last_anomaly or '' }}</td>
+</tr>
+{% endfor %}{% else %}<tr><td colspan="8">No data yet...</td></tr>{% endfor %}
 </tbody>
 </table>
 <p>JSON API: <a href="/api/status">/api/status</a></p>
 </body>
 </html>
-"""
+""")
+
+def make_app(monitor: DNSUptimerAI) -> web.Application:
+    app = web.Application()
+
+    async def json_status(request):
+        if orjson is None:
+            return web.json_response(monitor.snapshot())
+        return web.Response(body=orjson.dumps(monitor.snapshot()), content_type="application/json")
+
+    async def html_status(request):
+        html = _STATUS_TEMPLATE.render(
+            snap=monitor.snapshot(),
+            generated=time.strftime('%Y-%m-%d %H:%M:%S')
+        )
         return web.Response(text=html, content_type="text/html")
 
     app.add_routes([
@@ -1,14 +1,20 @@
 import requests
+from requests.adapters import HTTPAdapter
 
-def get_ip_info(ip_address=None):
+BATCH_URL = "http://ip-api.com/batch"
+BATCH_SIZE = 100  # ip-api.com limit per /batch request
+
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+
+def _ip_url(ip_address=None):
     if ip_address:
-        url = f"http://ip-api.com/json/{ip_address}"
-    else:
-        url = "http://ip-api.com/json/"
+        return f"http://ip-api.com/json/{ip_address}"
+    return "http://ip-api.com/json/"
 
-    response = requests.get(url, timeout=5)
-    data = response.json()
 
+def _format_ip_info(data):
     if data.get("status") == "success":
         return {
             "IP": data.get("query"),
@@ -25,6 +31,27 @@ def get_ip_info(ip_address=None):
     else:
         return {"error": "Failed to retrieve IP info"}
 
+
+def get_ip_info(ip_address=None):
+    response = _SESSION.get(_ip_url(ip_address), timeout=5)
+    return _format_ip_info(response.json())
+
+
+def get_ip_info_many(ip_addresses):
+    results = []
+    for i in range(0, len(ip_addresses), BATCH_SIZE):
+        chunk = ip_addresses[i:i + BATCH_SIZE]
+        response = _SESSION.post(BATCH_URL, json=[{"query": ip} for ip in chunk], timeout=10)
+        results.extend(_format_ip_info(data) for data in response.json())
+    return results
+
+
+async def get_ip_info_async(ip_address, client):
+    """Async lookup over a shared httpx.AsyncClient; gather many with asyncio."""
+    response = await client.get(_ip_url(ip_address), timeout=5)
+    return _format_ip_info(response.json())
+
+
 if __name__ == "__main__":
     info = get_ip_info("8.8.8.8")  # or None for your own IP
     for k, v in info.items():
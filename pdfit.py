@@ -1,20 +1,55 @@
+import asyncio
+import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, scrolledtext, messagebox
-import PyPDF2
-import openai
+from openai import AsyncOpenAI
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+    import PyPDF2
 
 # 🔑 Set your API key here (or use environment variable)
-openai.api_key = "YOUR_OPENAI_API_KEY"
+client = AsyncOpenAI(api_key="YOUR_OPENAI_API_KEY")
+
+INSERT_CHUNK = 65536  # characters per Text insert, keeps each UI stall short
+
+
+def read_pdf_text(file_path):
+    parts = []
+    if pdfium is not None:
+        # PDFium does the text extraction natively, much faster than PyPDF2
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            for page in pdf:
+                parts.append(page.get_textpage().get_text_range())
+                parts.append("\n")
+        finally:
+            pdf.close()
+    else:
+        with open(file_path, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            for page in reader.pages:
+                parts.append(page.extract_text() or "")
+                parts.append("\n")
+    return "".join(parts)
 
 class PDFReaderAI:
     def __init__(self, root):
         self.root = root
         self.root.title("AI PDF Reader")
         self.pdf_text = ""
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        # AI requests run as coroutines on a private event loop thread
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
 
         # Buttons
         tk.Button(root, text="Open PDF", command=self.open_pdf).pack(pady=5)
-        tk.Button(root, text="Ask AI", command=self.ask_ai).pack(pady=5)
+        self.ask_button = tk.Button(root, text="Ask AI", command=self.ask_ai)
+        self.ask_button.pack(pady=5)
 
         # PDF text display
         self.text_area = scrolledtext.ScrolledText(root, wrap=tk.WORD, width=80, height=20)
@@ -28,16 +63,24 @@ class PDFReaderAI:
         file_path = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
         if not file_path:
             return
+        future = self._pool.submit(read_pdf_text, file_path)
+        future.add_done_callback(lambda f: self.root.after(0, self._pdf_loaded, f))
+
+    def _pdf_loaded(self, future):
         try:
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                self.pdf_text = ""
-                for page in reader.pages:
-                    self.pdf_text += page.extract_text() + "\n"
-            self.text_area.delete(1.0, tk.END)
-            self.text_area.insert(tk.END, self.pdf_text)
+            self.pdf_text = future.result()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to read PDF: {e}")
+            return
+        self.text_area.delete(1.0, tk.END)
+        self._insert_chunk(self.pdf_text, 0)
+
+    def _insert_chunk(self, text, start):
+        if text is not self.pdf_text:
+            return  # another PDF was opened meanwhile
+        self.text_area.insert(tk.END, text[start:start + INSERT_CHUNK])
+        if start + INSERT_CHUNK < len(text):
+            self.root.after(0, self._insert_chunk, text, start + INSERT_CHUNK)
 
     def ask_ai(self):
         user_input = self.text_area.get(tk.SEL_FIRST, tk.SEL_LAST) if self.text_area.tag_ranges(tk.SEL) else self.text_area.get(1.0, tk.END)
@@ -45,18 +88,30 @@ class PDFReaderAI:
             messagebox.showwarning("Warning", "No text selected or available.")
             return
 
+        self.ask_button.config(state=tk.DISABLED)
+        self.response_area.delete(1.0, tk.END)
+        future = asyncio.run_coroutine_threadsafe(self._query_ai(user_input), self._loop)
+        future.add_done_callback(lambda f: self.root.after(0, self._ai_done, f))
+
+    async def _query_ai(self, user_input):
+        stream = await client.chat.completions.create(
+            model="gpt-4o-mini",  # or "gpt-4o", "gpt-3.5-turbo"
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that summarizes and explains PDF content."},
+                {"role": "user", "content": user_input}
+            ],
+            max_tokens=500,
+            stream=True
+        )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                self.root.after(0, self.response_area.insert, tk.END, delta)
+
+    def _ai_done(self, future):
+        self.ask_button.config(state=tk.NORMAL)
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o-mini",  # or "gpt-4o", "gpt-3.5-turbo"
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes and explains PDF content."},
-                    {"role": "user", "content": user_input}
-                ],
-                max_tokens=500
-            )
-            ai_text = response["choices"][0]["message"]["content"]
-            self.response_area.delete(1.0, tk.END)
-            self.response_area.insert(tk.END, ai_text)
+            future.result()
         except Exception as e:
             messagebox.showerror("Error", f"AI request failed: {e}")
 
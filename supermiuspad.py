@@ -3,26 +3,46 @@
 # Tested on Python 3.8+ (works down to 3.6 with minor tweaks)
 # No external dependencies. RTF save is basic; TXT is full-fidelity for plain text.
 
+import io
 import os
+import re
+import hashlib
 import sys
 import json
-import time
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog, colorchooser
+from tkinter import font as tkfont
 
 APP_NAME = "VistaPad AI"
 DEFAULT_FONT_FAMILY = "Segoe UI"
 DEFAULT_FONT_SIZE = 11
+AUTOSAVE_INTERVAL_MS = 15000
+FORMAT_TAGS = ("bold", "italic", "underline", "left", "center", "right", "highlight", "color")
+READ_CHUNK_SIZE = 1 << 20  # characters per Text insert when loading files
+
+# Prefer system defaults
+_FONT_LIST = (DEFAULT_FONT_FAMILY, "Arial", "Calibri", "Cambria", "Consolas", "Courier New", "Tahoma", "Times New Roman", "Verdana")
+
+@lru_cache(maxsize=1)
+def _available_fonts():
+    # Needs a Tk root; filters _FONT_LIST to installed families once per process
+    installed = set(tkfont.families())
+    return tuple(f for f in _FONT_LIST if f in installed) or _FONT_LIST
 
 # ---- AI Backend Contract ------------------------------------------------------
 # Set AI_ENDPOINT to your LLM gateway. The app POSTs:
 #   { "mode": "<summarize|continue|rewrite>", "text": "<input_text>", "system": "<optional>", "params": { ... } }
 # Expect JSON response:
 #   { "output": "<model_response>", "usage": { "prompt_tokens": int, "completion_tokens": int } }
+# An optional "append": true means "output" is a suffix to add to the end of the document.
 # Replace the dummy requester to actually call your backend.
 AI_ENDPOINT = os.environ.get("VISTAPAD_AI_ENDPOINT", "http://localhost:8000/llm")
 AI_REQUEST_TIMEOUT = 30
+AI_CACHE_SIZE = 32  # responses kept, keyed by (mode, system note, input text) digest
 
 # ---- Simple HTTP requester placeholder ---------------------------------------
 # Replace this with 'requests.post' or your custom client. Kept offline-safe.
@@ -37,9 +57,10 @@ def ai_post(url, payload, timeout=AI_REQUEST_TIMEOUT):
     text = payload.get("text", "")
     mode = payload.get("mode", "summarize")
     if mode == "summarize":
-        out = "Summary: " + (text[:400] + ("..." if len(text) > 400 else ""))
+        out = f"Summary: {text[:400]}{'...' if len(text) > 400 else ''}"
     elif mode == "continue":
-        out = text + "\n\n[AI] Continuing the text with a cohesive paragraph about your topic."
+        out = "\n\n[AI] Continuing the text with a cohesive paragraph about your topic."
+        return {"output": out, "append": True, "usage": {"prompt_tokens": len(text)//4, "completion_tokens": len(out)//4}}
     elif mode == "rewrite":
         out = "Rewritten: " + text.replace("\n", " ").strip()
     else:
@@ -48,109 +69,103 @@ def ai_post(url, payload, timeout=AI_REQUEST_TIMEOUT):
 
 # ---- Minimal RTF helpers (basic formatting only) ------------------------------
 # Note: Tk Text isn’t rich-text aware; we export/import very basic RTF for bold/italic/underline only.
+_RTF_TAGS = ("bold", "italic", "underline")
+_RTF_OPEN = {"bold": "\\b ", "italic": "\\i ", "underline": "\\ul "}
+_RTF_CLOSE = {"bold": "\\b0 ", "italic": "\\i0 ", "underline": "\\ulnone "}
+# Escaping is a single C-level str.translate per text slice
+_RTF_ESCAPE = str.maketrans({"\\": "\\\\", "{": "\\{", "}": "\\}", "\n": "\\par ", "\t": "\\tab "})
+
 def export_rtf(text_widget):
     # Collect text and basic inline tags (b,i,u). Alignment, bullets, font sizes are not serialized fully.
     text = text_widget.get("1.0", "end-1c")
-    # Tag spans
-    # For simplicity, map three tags: "bold", "italic", "underline"
-    spans = []
-    for tag in ("bold", "italic", "underline"):
+    # Absolute offset of each line start, to turn Tk "line.col" indices into string offsets
+    line_starts = [0]
+    nl = text.find("\n")
+    while nl != -1:
+        line_starts.append(nl + 1)
+        nl = text.find("\n", nl + 1)
+
+    def to_offset(idx):
+        line, col = map(int, str(idx).split("."))
+        return line_starts[line - 1] + col
+
+    # One open/close event per tag range; closes sort before opens at the same offset
+    events = []
+    for tag in _RTF_TAGS:
         ranges = text_widget.tag_ranges(tag)
         for i in range(0, len(ranges), 2):
-            start = ranges[i]
-            end = ranges[i+1]
-            spans.append((tag, start, end))
-
-    # Convert to RTF with naive control words.
-    # RTF header with Segoe UI default
-    rtf = ["{\\rtf1\\ansi\\deff0{\\fonttbl{\\f0 Segoe UI;}}\\fs22 "]
-    # We will walk character by character and open/close tags based on tag presence.
-    def pos_to_index(idx):
-        return tuple(map(int, str(idx).split(".")))  # (line, col)
-
-    cur_tags = set()
-    index = "1.0"
-    end_index = text_widget.index("end-1c")
-
-    def has_tag_at(tag, idx):
-        return idx in text_widget.tag_ranges(tag)
-
-    # Build tag map per index
-    # For efficiency: we’ll step through characters and query text_widget.tag_names(index)
-    while True:
-        ch = text_widget.get(index)
-        tags = set(text_widget.tag_names(index))
-        # Close tags that are no longer present
-        for t in list(cur_tags):
-            if t not in tags:
-                if t == "bold": rtf.append("\\b0 ")
-                if t == "italic": rtf.append("\\i0 ")
-                if t == "underline": rtf.append("\\ulnone ")
-                cur_tags.remove(t)
-        # Open tags newly present
-        for t in tags:
-            if t not in cur_tags and t in ("bold", "italic", "underline"):
-                if t == "bold": rtf.append("\\b ")
-                if t == "italic": rtf.append("\\i ")
-                if t == "underline": rtf.append("\\ul ")
-                cur_tags.add(t)
-        # Escape RTF specials
-        if ch == "\\":
-            rtf.append("\\\\")
-        elif ch == "{":
-            rtf.append("\\{")
-        elif ch == "}":
-            rtf.append("\\}")
-        elif ch == "\n":
-            rtf.append("\\par ")
-        else:
-            rtf.append(ch)
-
-        if index == end_index: break
-        index = text_widget.index(f"{index} + 1c")
-
-    # Close any open tags
-    for t in list(cur_tags):
-        if t == "bold": rtf.append("\\b0 ")
-        if t == "italic": rtf.append("\\i0 ")
-        if t == "underline": rtf.append("\\ulnone ")
-    rtf.append("}")
-    return "".join(rtf)
+            events.append((to_offset(ranges[i]), 1, tag))
+            events.append((to_offset(ranges[i+1]), 0, tag))
+    events.sort()
+
+    # RTF header with Segoe UI default, then escaped text slices between tag events
+    buf = io.StringIO()
+    buf.write("{\\rtf1\\ansi\\deff0{\\fonttbl{\\f0 Segoe UI;}}\\fs22 ")
+    pos = 0
+    for offset, opening, tag in events:
+        if offset > pos:
+            buf.write(text[pos:offset].translate(_RTF_ESCAPE))
+            pos = offset
+        buf.write(_RTF_OPEN[tag] if opening else _RTF_CLOSE[tag])
+    buf.write(text[pos:].translate(_RTF_ESCAPE))
+    buf.write("}")
+    return buf.getvalue()
+
+# Escaped literal | \par | \tab | other control word (+ numeric arg, one space) | group brace | raw line break
+_RTF_TOKEN = re.compile(r"\\([\\{}])|(\\par\b ?)|(\\tab\b ?)|\\[a-zA-Z]+-?\d* ?|[{}]|\r?\n")
+
+def _rtf_token_sub(m):
+    if m.group(1):
+        return m.group(1)
+    if m.group(2):
+        return "\n"
+    return "\t" if m.group(3) else ""
 
 def import_rtf_to_text(text_widget, rtf_data):
     # Very naive: strip control words and insert plain text, then we don’t reconstruct tags.
     # If you want real RTF import, integrate a parser (e.g., PyRTF or your own).
-    # For now, fall back to plain text extraction.
-    # Extract text by removing braces and common control sequences.
-    filtered = []
-    i = 0
-    while i < len(rtf_data):
-        ch = rtf_data[i]
-        if ch == "{":
-            i += 1
-            continue
-        if ch == "}":
-            i += 1
-            continue
-        if ch == "\\":
-            # skip control word
-            j = i + 1
-            while j < len(rtf_data) and rtf_data[j].isalpha():
-                j += 1
-            # skip optional numeric
-            while j < len(rtf_data) and rtf_data[j] in "-0123456789":
-                j += 1
-            # skip optional space
-            if j < len(rtf_data) and rtf_data[j] == " ":
-                j += 1
-            # handle special \par
-            # We won't attempt to reconstruct tags; insert newline for \par if desired
-            i = j
-            continue
-        filtered.append(ch)
-        i += 1
+    # For now, fall back to plain text extraction in a single regex pass.
     text_widget.delete("1.0", "end")
-    text_widget.insert("1.0", "".join(filtered))
+    text_widget.insert("1.0", _RTF_TOKEN.sub(_rtf_token_sub, rtf_data))
+
+# ---- Menu layout ------------------------------------------------------------
+# (label, accelerator, action): action is a VistaPadAI method name or a virtual
+# event sent to the editor; None is a separator; a trailing "check" makes a checkbutton.
+MENU_SPEC = (
+    ("File", (
+        ("New", "Ctrl+N", "on_new"),
+        ("Open...", "Ctrl+O", "on_open"),
+        ("Save", "Ctrl+S", "on_save"),
+        ("Save As...", None, "on_save_as"),
+        None,
+        ("Page setup...", None, "on_page_setup"),  # placeholder
+        ("Print...", "Ctrl+P", "on_print"),
+        None,
+        ("Exit", None, "on_exit"),
+    )),
+    ("Edit", (
+        ("Undo", "Ctrl+Z", "<<Undo>>"),
+        ("Redo", "Ctrl+Y", "<<Redo>>"),
+        None,
+        ("Cut", "Ctrl+X", "<<Cut>>"),
+        ("Copy", "Ctrl+C", "<<Copy>>"),
+        ("Paste", "Ctrl+V", "<<Paste>>"),
+        None,
+        ("Find/Replace", "Ctrl+F", "on_find_replace"),
+        ("Select All", "Ctrl+A", "select_all"),
+    )),
+    ("Format", (
+        ("Font...", None, "on_font_dialog"),
+        ("Text color...", None, "on_text_color"),
+        ("Highlight...", None, "on_text_bg"),
+    )),
+    ("View", (
+        ("Dark mode", None, "toggle_dark", "check"),
+    )),
+    ("Help", (
+        ("About VistaPad AI", None, "on_about"),
+    )),
+)
 
 # ---- Main application ---------------------------------------------------------
 class VistaPadAI(tk.Tk):
@@ -166,11 +181,15 @@ class VistaPadAI(tk.Tk):
         self._status_msg = tk.StringVar(value="Ready")
         self._word_count = tk.StringVar(value="Words: 0")
         self._llm_busy = tk.BooleanVar(value=False)
+        self._wc_job = None
+        self._autosave_pool = ThreadPoolExecutor(max_workers=1)
+        self._ai_cache = OrderedDict()
+        self._applied_font = (DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE)
 
         self._create_style()
-        self._create_menu()
         self._create_ribbon()
         self._create_body()
+        self._create_menu()  # after the body: edit commands bind to self.text
         self._create_statusbar()
         self._bind_shortcuts()
         self._start_autosave()
@@ -193,49 +212,19 @@ class VistaPadAI(tk.Tk):
 
     def _create_menu(self):
         menubar = tk.Menu(self)
-        # File
-        filem = tk.Menu(menubar, tearoff=0)
-        filem.add_command(label="New", accelerator="Ctrl+N", command=self.on_new)
-        filem.add_command(label="Open...", accelerator="Ctrl+O", command=self.on_open)
-        filem.add_command(label="Save", accelerator="Ctrl+S", command=self.on_save)
-        filem.add_command(label="Save As...", command=self.on_save_as)
-        filem.add_separator()
-        filem.add_command(label="Page setup...", command=self.on_page_setup)  # placeholder
-        filem.add_command(label="Print...", accelerator="Ctrl+P", command=self.on_print)
-        filem.add_separator()
-        filem.add_command(label="Exit", command=self.on_exit)
-        menubar.add_cascade(label="File", menu=filem)
-
-        # Edit
-        editm = tk.Menu(menubar, tearoff=0)
-        editm.add_command(label="Undo", accelerator="Ctrl+Z", command=lambda: self.text.event_generate("<<Undo>>"))
-        editm.add_command(label="Redo", accelerator="Ctrl+Y", command=lambda: self.text.event_generate("<<Redo>>"))
-        editm.add_separator()
-        editm.add_command(label="Cut", accelerator="Ctrl+X", command=lambda: self.text.event_generate("<<Cut>>"))
-        editm.add_command(label="Copy", accelerator="Ctrl+C", command=lambda: self.text.event_generate("<<Copy>>"))
-        editm.add_command(label="Paste", accelerator="Ctrl+V", command=lambda: self.text.event_generate("<<Paste>>"))
-        editm.add_separator()
-        editm.add_command(label="Find/Replace", accelerator="Ctrl+F", command=self.on_find_replace)
-        editm.add_command(label="Select All", accelerator="Ctrl+A", command=lambda: self.text.tag_add("sel", "1.0", "end-1c"))
-        menubar.add_cascade(label="Edit", menu=editm)
-
-        # Format
-        formatm = tk.Menu(menubar, tearoff=0)
-        formatm.add_command(label="Font...", command=self.on_font_dialog)
-        formatm.add_command(label="Text color...", command=self.on_text_color)
-        formatm.add_command(label="Highlight...", command=self.on_text_bg)
-        menubar.add_cascade(label="Format", menu=formatm)
-
-        # View
-        viewm = tk.Menu(menubar, tearoff=0)
-        viewm.add_checkbutton(label="Dark mode", command=self.toggle_dark)
-        menubar.add_cascade(label="View", menu=viewm)
-
-        # Help
-        helpm = tk.Menu(menubar, tearoff=0)
-        helpm.add_command(label="About VistaPad AI", command=lambda: messagebox.showinfo(APP_NAME, f"{APP_NAME}\nA Vista-style WordPad with AI panel.\nSingle-file Tkinter app."))
-        menubar.add_cascade(label="Help", menu=helpm)
-
+        for label, items in MENU_SPEC:
+            menu = tk.Menu(menubar, tearoff=0)
+            for item in items:
+                if item is None:
+                    menu.add_separator()
+                    continue
+                name, accel, action = item[:3]
+                cmd = partial(self.text.event_generate, action) if action.startswith("<<") else getattr(self, action)
+                if item[3:] == ("check",):
+                    menu.add_checkbutton(label=name, command=cmd)
+                else:
+                    menu.add_command(label=name, accelerator=accel or "", command=cmd)
+            menubar.add_cascade(label=label, menu=menu)
         self.config(menu=menubar)
 
     def _create_ribbon(self):
@@ -304,9 +293,15 @@ class VistaPadAI(tk.Tk):
         scroll.pack(side="right", fill="y")
         self.text.config(yscrollcommand=scroll.set)
 
+        # Named fonts: apply_font reconfigures these in place instead of rebuilding tag fonts
+        self._base_font = tkfont.Font(family=DEFAULT_FONT_FAMILY, size=DEFAULT_FONT_SIZE)
+        self._bold_font = tkfont.Font(family=DEFAULT_FONT_FAMILY, size=DEFAULT_FONT_SIZE, weight="bold")
+        self._italic_font = tkfont.Font(family=DEFAULT_FONT_FAMILY, size=DEFAULT_FONT_SIZE, slant="italic")
+        self.text.configure(font=self._base_font)
+
         # Setup tags
-        self.text.tag_configure("bold", font=(DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE, "bold"))
-        self.text.tag_configure("italic", font=(DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE, "italic"))
+        self.text.tag_configure("bold", font=self._bold_font)
+        self.text.tag_configure("italic", font=self._italic_font)
         self.text.tag_configure("underline", underline=1)
         self.text.tag_configure("left", justify="left")
         self.text.tag_configure("center", justify="center")
@@ -352,36 +347,55 @@ class VistaPadAI(tk.Tk):
         self.bind("<Control-s>", lambda e: self.on_save())
         self.bind("<Control-p>", lambda e: self.on_print())
         self.bind("<Control-f>", lambda e: self.on_find_replace())
-        self.bind("<Control-a>", lambda e: self.text.tag_add("sel", "1.0", "end-1c"))
-        self.text.bind("<KeyRelease>", lambda e: self.update_word_count())
+        self.bind("<Control-a>", lambda e: self.select_all())
 
     def _start_autosave(self):
-        def autosave_loop():
-            while True:
-                time.sleep(15)
-                try:
-                    content = self.text.get("1.0", "end-1c")
-                    with open(self._autosave_path, "w", encoding="utf-8") as f:
-                        f.write(content)
-                except Exception:
-                    pass
-        t = threading.Thread(target=autosave_loop, daemon=True)
-        t.start()
+        self._autosave_hash = None
+        self._autosave_pending = False
+        self.after(AUTOSAVE_INTERVAL_MS, self._autosave_tick)
+
+    def _autosave_tick(self):
+        # Read the widget on the Tk thread; only the file write goes to the pool
+        if self._autosave_pending:
+            self._autosave_pending = False
+            content = self.text.get("1.0", "end-1c")
+            digest = hash(content)
+            if digest != self._autosave_hash:
+                self._autosave_hash = digest
+                self._autosave_pool.submit(self._write_autosave, content)
+        self.after(AUTOSAVE_INTERVAL_MS, self._autosave_tick)
+
+    def _write_autosave(self, content):
+        tmp_path = self._autosave_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, self._autosave_path)
+        except Exception:
+            pass
 
     def _list_fonts(self):
-        # Prefer system defaults
-        return [DEFAULT_FONT_FAMILY, "Arial", "Calibri", "Cambria", "Consolas", "Courier New", "Tahoma", "Times New Roman", "Verdana"]
+        return _available_fonts()
 
     def _on_modified(self, event):
         self._dirty = bool(self.text.edit_modified())
+        if self._dirty:
+            # Resetting the flag below fires <<Modified>> again with it cleared,
+            # so autosave keeps its own flag that only the tick clears
+            self._autosave_pending = True
         self.text.edit_modified(False)
-        self.update_word_count()
+        self._schedule_word_count()
         self._status_msg.set("Modified" if self._dirty else "Ready")
 
+    def _schedule_word_count(self):
+        # Coalesce bursts of typing into one recount
+        if self._wc_job:
+            self.after_cancel(self._wc_job)
+        self._wc_job = self.after(150, self.update_word_count)
+
     def update_word_count(self):
-        text = self.text.get("1.0", "end-1c")
-        words = [w for w in text.split() if w.strip()]
-        self._word_count.set(f"Words: {len(words)}")
+        self._wc_job = None
+        self._word_count.set(f"Words: {len(self.text.get('1.0', 'end-1c').split())}")
 
     # ---- File ops ----
     def on_new(self):
@@ -397,12 +411,11 @@ class VistaPadAI(tk.Tk):
         if not path: return
         try:
             with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                data = f.read()
-            if path.lower().endswith(".rtf"):
-                import_rtf_to_text(self.text, data)
-            else:
-                self.text.delete("1.0", "end")
-                self.text.insert("1.0", data)
+                if path.lower().endswith(".rtf"):
+                    import_rtf_to_text(self.text, f.read())
+                else:
+                    self.text.delete("1.0", "end")
+                    self.load_text_file(f)
             self._file_path = path
             self._dirty = False
             self._status_msg.set(f"Opened: {os.path.basename(path)}")
@@ -410,6 +423,14 @@ class VistaPadAI(tk.Tk):
         except Exception as e:
             messagebox.showerror("Open error", str(e))
 
+    def load_text_file(self, f):
+        # Feed Tk in chunks so the whole file is never held twice in memory
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            self.text.insert("end-1c", chunk)
+
     def on_save(self):
         if not self._file_path:
             return self.on_save_as()
@@ -436,17 +457,27 @@ class VistaPadAI(tk.Tk):
         messagebox.showinfo("Page setup", "Page setup is not implemented in this demo.")
 
     def on_print(self):
+        # Spool the temp file off the UI thread; Windows print via default app on completion
+        data = self.text.get("1.0", "end-1c")
+        fut = self._autosave_pool.submit(self._spool_print, data)
+        fut.add_done_callback(lambda f: self.after(0, self._print_done, f))
+
+    def _spool_print(self, data):
+        import tempfile
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w", encoding="utf-8") as tmp:
+            tmp.write(data)
+        return tmp.name
+
+    def _print_done(self, fut):
         try:
-            # Windows: write to temp file and open print dialog via default app
-            import tempfile
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w", encoding="utf-8")
-            tmp.write(self.text.get("1.0", "end-1c"))
-            tmp.close()
-            os.startfile(tmp.name, "print")
+            os.startfile(fut.result(), "print")
             self._status_msg.set("Sent to printer")
         except Exception as e:
             messagebox.showerror("Print error", str(e))
 
+    def on_about(self):
+        messagebox.showinfo(APP_NAME, f"{APP_NAME}\nA Vista-style WordPad with AI panel.\nSingle-file Tkinter app.")
+
     def on_exit(self):
         if not self._confirm_discard(): return
         self.destroy()
@@ -457,13 +488,18 @@ class VistaPadAI(tk.Tk):
         return True
 
     # ---- Formatting ----
+    def select_all(self):
+        self.text.tag_add("sel", "1.0", "end-1c")
+
     def apply_font(self):
         family = self.font_family.get()
         size = self.font_size.get()
-        self.text.configure(font=(family, size))
-        # Update basic tag fonts
-        self.text.tag_configure("bold", font=(family, size, "bold"))
-        self.text.tag_configure("italic", font=(family, size, "italic"))
+        # Reconfiguring tag fonts re-measures every tagged range; skip no-op changes
+        if (family, size) == self._applied_font:
+            return
+        self._applied_font = (family, size)
+        for f in (self._base_font, self._bold_font, self._italic_font):
+            f.configure(family=family, size=size)
 
     def toggle_tag(self, tag):
         try:
@@ -480,11 +516,13 @@ class VistaPadAI(tk.Tk):
             start, end = self.text.index("sel.first linestart"), self.text.index("sel.last lineend")
         except tk.TclError:
             return
-        self.text.tag_remove("left", start, end)
-        self.text.tag_remove("center", start, end)
-        self.text.tag_remove("right", start, end)
+        self._tag_remove_many(("left", "center", "right"), start, end)
         self.text.tag_add(align, start, end)
 
+    def _tag_remove_many(self, tags, start, end):
+        # One Tcl script instead of a Python->Tcl round trip per tag
+        self.tk.eval("\n".join(f"{self.text} tag remove {t} {start} {end}" for t in tags))
+
     def insert_bullet(self):
         try:
             start = self.text.index("insert linestart")
@@ -493,14 +531,7 @@ class VistaPadAI(tk.Tk):
             pass
 
     def clear_formatting(self):
-        self.text.tag_remove("bold", "1.0", "end")
-        self.text.tag_remove("italic", "1.0", "end")
-        self.text.tag_remove("underline", "1.0", "end")
-        self.text.tag_remove("left", "1.0", "end")
-        self.text.tag_remove("center", "1.0", "end")
-        self.text.tag_remove("right", "1.0", "end")
-        self.text.tag_remove("highlight", "1.0", "end")
-        self.text.tag_remove("color", "1.0", "end")
+        self._tag_remove_many(FORMAT_TAGS, "1.0", "end")
         self._status_msg.set("Formatting cleared")
 
     def on_text_color(self):
@@ -552,9 +583,10 @@ class VistaPadAI(tk.Tk):
     def _find_next(self, needle):
         self.text.tag_remove("found", "1.0", "end")
         if not needle: return
-        pos = self.text.search(needle, "insert", nocase=True, stopindex="end")
+        count = tk.IntVar()
+        pos = self.text.search(needle, "insert", nocase=True, stopindex="end", count=count)
         if pos:
-            end = f"{pos}+{len(needle)}c"
+            end = f"{pos}+{count.get()}c"
             self.text.tag_add("found", pos, end)
             self.text.tag_configure("found", background="#a1d6ff")
             self.text.mark_set("insert", end)
@@ -562,23 +594,25 @@ class VistaPadAI(tk.Tk):
 
     def _replace(self, needle, repl):
         if not needle: return
-        pos = self.text.search(needle, "insert", nocase=True, stopindex="end")
+        count = tk.IntVar()
+        pos = self.text.search(needle, "insert", nocase=True, stopindex="end", count=count)
         if pos:
-            end = f"{pos}+{len(needle)}c"
-            self.text.delete(pos, end)
+            self.text.delete(pos, f"{pos}+{count.get()}c")
             self.text.insert(pos, repl)
             self.text.mark_set("insert", f"{pos}+{len(repl)}c")
 
     def _replace_all(self, needle, repl):
         if not needle: return
-        start = "1.0"
-        while True:
-            pos = self.text.search(needle, start, nocase=True, stopindex="end")
-            if not pos: break
-            end = f"{pos}+{len(needle)}c"
-            self.text.delete(pos, end)
-            self.text.insert(pos, repl)
-            start = f"{pos}+{len(repl)}c"
+        # Find matches in one get() instead of a Tk search per match, then edit
+        # only the matched spans (last first, so earlier offsets stay valid) to
+        # keep the formatting tags on the rest of the text
+        content = self.text.get("1.0", "end-1c")
+        matches = list(re.finditer(re.escape(needle), content, re.IGNORECASE))
+        if not matches: return
+        for m in reversed(matches):
+            start = f"1.0+{m.start()}c"
+            self.text.delete(start, f"1.0+{m.end()}c")
+            self.text.insert(start, repl)
 
     # ---- Dark mode ----
     def toggle_dark(self):
@@ -603,6 +637,14 @@ class VistaPadAI(tk.Tk):
         input_text = sel_text if (mode == "rewrite" and sel_text.strip()) else doc_text
         sys_note = self.ai_prompt.get("1.0", "end-1c").strip()
 
+        # Identical requests are answered from the response cache without a round trip
+        key = hashlib.blake2b(f"{mode}|{sys_note}|".encode() + input_text.encode(), digest_size=16).digest()
+        cached = self._ai_cache.get(key)
+        if cached is not None:
+            self._ai_cache.move_to_end(key)
+            self._show_ai_response(mode, sel_text, cached, cached_tokens=len(input_text)//4)
+            return
+
         payload = {"mode": mode, "text": input_text, "system": sys_note, "params": {"temperature": 0.7}}
         self._status_msg.set("AI running...")
         self._llm_busy.set(True)
@@ -610,18 +652,10 @@ class VistaPadAI(tk.Tk):
         def worker():
             try:
                 resp = ai_post(AI_ENDPOINT, payload, timeout=AI_REQUEST_TIMEOUT)
-                out = resp.get("output", "")
-                usage = resp.get("usage", {})
-                self.ai_output.delete("1.0", "end")
-                self.ai_output.insert("1.0", out)
-                # If rewrite with selection, replace in doc
-                if mode == "rewrite" and sel_text.strip():
-                    try:
-                        self.text.delete("sel.first", "sel.last")
-                        self.text.insert("insert", out)
-                    except tk.TclError:
-                        pass
-                self._status_msg.set(f"AI done. Tokens: {usage.get('prompt_tokens', 0)}/{usage.get('completion_tokens', 0)}")
+                self._ai_cache[key] = resp
+                if len(self._ai_cache) > AI_CACHE_SIZE:
+                    self._ai_cache.popitem(last=False)
+                self._show_ai_response(mode, sel_text, resp)
             except Exception as e:
                 self.ai_output.delete("1.0", "end")
                 self.ai_output.insert("1.0", f"AI error: {e}")
@@ -631,6 +665,23 @@ class VistaPadAI(tk.Tk):
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def _show_ai_response(self, mode, sel_text, resp, cached_tokens=0):
+        out = resp.get("output", "")
+        usage = resp.get("usage", {})
+        if resp.get("append"):
+            self.text.insert("end", out)
+        else:
+            self.ai_output.delete("1.0", "end")
+            self.ai_output.insert("1.0", out)
+        # If rewrite with selection, replace in doc
+        if mode == "rewrite" and sel_text.strip():
+            try:
+                self.text.delete("sel.first", "sel.last")
+                self.text.insert("insert", out)
+            except tk.TclError:
+                pass
+        self._status_msg.set(f"AI done. Tokens: {usage.get('prompt_tokens', 0)}/{usage.get('completion_tokens', 0)} (cached: {cached_tokens})")
+
 # ---- Entry point ----
 def main():
     app = VistaPadAI()
@@ -638,7 +689,7 @@ def main():
     try:
         if os.path.exists(app._autosave_path) and os.path.getsize(app._autosave_path) > 0:
             with open(app._autosave_path, "r", encoding="utf-8") as f:
-                app.text.insert("1.0", f.read())
+                app.load_text_file(f)
             app._status_msg.set("Recovered autosave")
             app.update_word_count()
     except Exception:
@@ -11,14 +11,16 @@ AI LLM Battery Laptop Manager (Tkinter, cross-platform)
 import os
 import sys
 import time
+import shutil
 import platform
+import functools
 import subprocess
 import threading
+from collections import deque
 from datetime import datetime
-from queue import Queue, Empty
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 
 # Optional deps: psutil (pip install psutil)
 try:
@@ -27,8 +29,16 @@ except ImportError:
     psutil = None
 
 APP_NAME = "AI Battery Manager"
-SAMPLE_INTERVAL_SEC = 10
+SAMPLE_INTERVAL_SEC = 10   # max seconds between logged samples
+BATTERY_INTERVAL_SEC = 5   # battery state changes slowly; poll it less often
+CPU_INTERVAL_SEC = 1
 LOG_MAX_LINES = 5000
+_OS_NAME = platform.system().lower()
+
+# Status label texts
+_BATT_UNK = "Battery: -"
+_CPU_UNK = "CPU: -"
+_POWER_TEXT = {True: "Power: Plugged", False: "Power: Battery", None: "Power: -"}
 
 # -------------- Backend contract for AI (wire your LLM here) --------------
 
@@ -49,10 +59,8 @@ def backend_contract_llm(context: dict, prompt: str) -> str:
       - Output: plain string response
     """
     # Stubbed "smart" suggestions; replace with real LLM request
-    bp = context.get('battery_percent')
-    plugged = context.get('power_plugged')
-    cpu = context.get('cpu_percent')
-    secs_left = context.get('secs_left')
+    get = context.get
+    bp, plugged, cpu, secs_left = (get(k) for k in ('battery_percent', 'power_plugged', 'cpu_percent', 'secs_left'))
 
     def fmt_time(s):
         if s is None or s < 0:
@@ -82,8 +90,7 @@ def backend_contract_llm(context: dict, prompt: str) -> str:
         advice.append("You’re in good shape. Keep apps minimal and brightness moderate for best endurance.")
 
     # Simple prompt-aware reply
-    reply = f"{baseline}\n\nPrompt: {prompt}\n\nSuggestions:\n- " + "\n- ".join(advice)
-    return reply
+    return f"{baseline}\n\nPrompt: {prompt}\n\nSuggestions:\n- " + "\n- ".join(advice)
 
 # -------------- Utilities and platform-aware actions --------------
 
@@ -98,139 +105,158 @@ def get_battery_info():
     except Exception:
         return None, None, None
 
-def get_cpu_percent():
+_cpu_cache = {"ts": None, "value": None}
+
+def get_cpu_percent(min_interval=1.0):
     if psutil is None:
         return None
+    # Reuse the last reading if it is younger than min_interval seconds
+    now = time.monotonic()
+    if _cpu_cache["ts"] is not None and now - _cpu_cache["ts"] < min_interval:
+        return _cpu_cache["value"]
     try:
         # psutil.cpu_percent(interval=0.2) blocks briefly; 0 for non-blocking
-        return psutil.cpu_percent(interval=0.0)
+        value = psutil.cpu_percent(interval=0.0)
     except Exception:
-        return None
-
-def dim_brightness_best_effort():
-    """
-    Best-effort brightness dim:
-      - Windows: monitor brightness via WMI (requires admin) fallback to no-op
-      - macOS: uses 'brightness' utility if present (brew install brightness)
-      - Linux: tries xbacklight/light, else sysfs (requires permissions)
-    Returns (success:bool, message:str)
-    """
-    os_name = platform.system().lower()
-
-    try:
-        if os_name == "windows":
-            # Try WMI via powershell: set brightness to 30%
-            cmd = [
-                "powershell",
-                "-NoProfile",
-                "-ExecutionPolicy", "Bypass",
-                "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1,30) | Out-Null"
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return True, "Brightness set to ~30% (Windows)."
-            return False, "Couldn’t change brightness (Windows). Try running as admin."
-
-        elif os_name == "darwin":
-            # macOS: brightness tool
-            if shutil_which("brightness"):
-                result = subprocess.run(["brightness", "0.3"])
-                if result.returncode == 0:
-                    return True, "Brightness set to 30% (macOS)."
-                return False, "Failed to change brightness (macOS)."
-            return False, "Install 'brightness' utility (brew install brightness)."
-
-        else:
-            # Linux: try light, xbacklight, then sysfs
-            if shutil_which("light"):
-                r = subprocess.run(["light", "-S", "30"])
-                if r.returncode == 0:
-                    return True, "Brightness set to 30% using light."
-            if shutil_which("xbacklight"):
-                r = subprocess.run(["xbacklight", "-set", "30"])
-                if r.returncode == 0:
-                    return True, "Brightness set to 30% using xbacklight."
-            # sysfs
-            paths = [
-                "/sys/class/backlight/intel_backlight",
-                "/sys/class/backlight/acpi_video0",
-                "/sys/class/backlight/amdgpu_bl0",
-            ]
-            for p in paths:
-                try:
-                    maxp = os.path.join(p, "max_brightness")
-                    curp = os.path.join(p, "brightness")
-                    if os.path.exists(maxp) and os.path.exists(curp):
-                        with open(maxp, "r") as f:
-                            maxb = int(f.read().strip())
-                        target = max(1, int(maxb * 0.3))
-                        with open(curp, "w") as f:
-                            f.write(str(target))
-                        return True, "Brightness set to ~30% via sysfs."
-                except Exception:
-                    continue
-            return False, "Couldn’t adjust brightness (Linux). Try running with proper permissions."
-
-    except Exception as e:
-        return False, f"Error: {e}"
-
-def shutil_which(cmd):
-    # small helper to avoid importing shutil
-    paths = os.environ.get("PATH", "").split(os.pathsep)
-    exts = [""] if platform.system().lower() != "windows" else os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").split(";")
-    for d in paths:
-        for ext in exts:
-            candidate = os.path.join(d, cmd + ext)
-            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
-                return candidate
-    return None
-
-def toggle_wifi_best_effort():
-    """
-    Toggle Wi‑Fi best-effort:
-      - Windows: netsh to disable/enable WLAN interface
-      - macOS: networksetup on Wi‑Fi
-      - Linux: nmcli radio wifi off/on (requires NetworkManager)
-    Returns (success:bool, message:str)
-    """
-    os_name = platform.system().lower()
-    try:
-        if os_name == "windows":
-            # Query interfaces
-            q = subprocess.run(["netsh", "wlan", "show", "interfaces"], capture_output=True, text=True)
-            if q.returncode != 0:
-                return False, "Failed to query Wi‑Fi interfaces."
-            text = q.stdout.lower()
-            # Try to toggle by setting hostednetwork or interface state is non-trivial; provide quick off
-            off = subprocess.run(["netsh", "interface", "set", "interface", "name=\"Wi-Fi\"", "admin=disabled"], capture_output=True, text=True)
-            if off.returncode == 0:
-                return True, "Wi‑Fi disabled (Windows). Run again to re-enable."
-            # Fallback: try WLAN service
-            off2 = subprocess.run(["netsh", "wlan", "disconnect"], capture_output=True, text=True)
-            if off2.returncode == 0:
-                return True, "Wi‑Fi disconnected (Windows)."
-            return False, "Couldn’t toggle Wi‑Fi (Windows). Try as admin."
-
-        elif os_name == "darwin":
-            # macOS
-            if shutil_which("networksetup"):
-                off = subprocess.run(["networksetup", "-setairportpower", "Wi-Fi", "off"])
-                if off.returncode == 0:
-                    return True, "Wi‑Fi turned off (macOS). Run again to turn on."
-                return False, "Failed to toggle Wi‑Fi (macOS)."
-            return False, "networksetup not found (macOS)."
-
-        else:
-            # Linux
-            if shutil_which("nmcli"):
-                off = subprocess.run(["nmcli", "radio", "wifi", "off"])
-                if off.returncode == 0:
-                    return True, "Wi‑Fi off via nmcli. Run again to turn on."
-                return False, "Failed to toggle Wi‑Fi with nmcli."
-            return False, "nmcli not available. Try your distro’s network tool."
-
-    except Exception as e:
-        return False, f"Error: {e}"
+        value = None
+    _cpu_cache["ts"] = now
+    _cpu_cache["value"] = value
+    return value
+
+_BACKLIGHT_PATHS = (
+    "/sys/class/backlight/intel_backlight",
+    "/sys/class/backlight/acpi_video0",
+    "/sys/class/backlight/amdgpu_bl0",
+)
+_bl_path = None  # first usable backlight dir, False if none
+_bl_max = None
+
+def _sample_changed(prev, cur):
+    # Battery moved >= 1%, plug state flipped, or CPU moved >= 5 points
+    if prev["power_plugged"] != cur["power_plugged"]:
+        return True
+    for key, delta in (("battery_percent", 1), ("cpu_percent", 5)):
+        a, b = prev[key], cur[key]
+        if (a is None) != (b is None) or (a is not None and abs(a - b) >= delta):
+            return True
+    return False
+
+def _best_effort(fn):
+    # Platform actions report failures as (False, message) instead of raising
+    @functools.wraps(fn)
+    def wrapper():
+        try:
+            return fn()
+        except Exception as e:
+            return False, f"Error: {e}"
+    return wrapper
+
+@functools.lru_cache(maxsize=64)
+def _which(cmd):
+    # PATH lookups are stable for the session; probe each tool once
+    return shutil.which(cmd)
+
+# Best-effort brightness dim, returns (success:bool, message:str):
+#   - Windows: monitor brightness via WMI (requires admin) fallback to no-op
+#   - macOS: uses 'brightness' utility if present (brew install brightness)
+#   - Linux: tries xbacklight/light, else sysfs (requires permissions)
+
+@_best_effort
+def _dim_windows():
+    # Try WMI via powershell: set brightness to 30%
+    cmd = [
+        "powershell",
+        "-NoProfile",
+        "-ExecutionPolicy", "Bypass",
+        "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1,30) | Out-Null"
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode == 0:
+        return True, "Brightness set to ~30% (Windows)."
+    return False, "Couldn’t change brightness (Windows). Try running as admin."
+
+@_best_effort
+def _dim_darwin():
+    # macOS: brightness tool
+    if _which("brightness"):
+        result = subprocess.run(["brightness", "0.3"])
+        if result.returncode == 0:
+            return True, "Brightness set to 30% (macOS)."
+        return False, "Failed to change brightness (macOS)."
+    return False, "Install 'brightness' utility (brew install brightness)."
+
+@_best_effort
+def _dim_linux():
+    global _bl_path, _bl_max
+    # Linux: try light, xbacklight, then sysfs
+    if _which("light"):
+        r = subprocess.run(["light", "-S", "30"])
+        if r.returncode == 0:
+            return True, "Brightness set to 30% using light."
+    if _which("xbacklight"):
+        r = subprocess.run(["xbacklight", "-set", "30"])
+        if r.returncode == 0:
+            return True, "Brightness set to 30% using xbacklight."
+    # sysfs: the backlight device and its max are probed once per session
+    if _bl_path is None:
+        _bl_path = next((p for p in _BACKLIGHT_PATHS
+                         if os.path.exists(os.path.join(p, "max_brightness"))
+                         and os.path.exists(os.path.join(p, "brightness"))), False)
+    if _bl_path:
+        try:
+            if _bl_max is None:
+                with open(os.path.join(_bl_path, "max_brightness"), "r") as f:
+                    _bl_max = int(f.read().strip())
+            target = max(1, int(_bl_max * 0.3))
+            with open(os.path.join(_bl_path, "brightness"), "w") as f:
+                f.write(str(target))
+            return True, "Brightness set to ~30% via sysfs."
+        except Exception:
+            pass
+    return False, "Couldn’t adjust brightness (Linux). Try running with proper permissions."
+
+# Toggle Wi‑Fi best-effort, returns (success:bool, message:str):
+#   - Windows: netsh to disable/enable WLAN interface
+#   - macOS: networksetup on Wi‑Fi
+#   - Linux: nmcli radio wifi off/on (requires NetworkManager)
+
+@_best_effort
+def _wifi_windows():
+    # Query interfaces
+    q = subprocess.run(["netsh", "wlan", "show", "interfaces"], capture_output=True, text=True)
+    if q.returncode != 0:
+        return False, "Failed to query Wi‑Fi interfaces."
+    # Try to toggle by setting hostednetwork or interface state is non-trivial; provide quick off
+    off = subprocess.run(["netsh", "interface", "set", "interface", "name=\"Wi-Fi\"", "admin=disabled"], capture_output=True, text=True)
+    if off.returncode == 0:
+        return True, "Wi‑Fi disabled (Windows). Run again to re-enable."
+    # Fallback: try WLAN service
+    off2 = subprocess.run(["netsh", "wlan", "disconnect"], capture_output=True, text=True)
+    if off2.returncode == 0:
+        return True, "Wi‑Fi disconnected (Windows)."
+    return False, "Couldn’t toggle Wi‑Fi (Windows). Try as admin."
+
+@_best_effort
+def _wifi_darwin():
+    if _which("networksetup"):
+        off = subprocess.run(["networksetup", "-setairportpower", "Wi-Fi", "off"])
+        if off.returncode == 0:
+            return True, "Wi‑Fi turned off (macOS). Run again to turn on."
+        return False, "Failed to toggle Wi‑Fi (macOS)."
+    return False, "networksetup not found (macOS)."
+
+@_best_effort
+def _wifi_linux():
+    if _which("nmcli"):
+        off = subprocess.run(["nmcli", "radio", "wifi", "off"])
+        if off.returncode == 0:
+            return True, "Wi‑Fi off via nmcli. Run again to turn on."
+        return False, "Failed to toggle Wi‑Fi with nmcli."
+    return False, "nmcli not available. Try your distro’s network tool."
+
+# Platform implementations are chosen once at import
+dim_brightness_best_effort = {"windows": _dim_windows, "darwin": _dim_darwin}.get(_OS_NAME, _dim_linux)
+toggle_wifi_best_effort = {"windows": _wifi_windows, "darwin": _wifi_darwin}.get(_OS_NAME, _wifi_linux)
 
 # -------------- App UI and logic --------------
 
@@ -242,12 +268,18 @@ class BatteryManagerApp:
         root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.running = True
 
-        self.sample_queue = Queue()
-        self.log_lines = []
+        self.log_lines = deque(maxlen=LOG_MAX_LINES)
+        # Latest sampler snapshot, read by UI handlers instead of re-querying psutil.
+        # _latest holds a sample not yet shown; newer samples simply replace it.
+        self._last_sample = {}
+        self._latest = None
+        self._sample_lock = threading.Lock()
+        self._last_displayed = {}
+        self._ts_cache = (0, "")  # (epoch second, formatted timestamp)
+        self._platform_str = platform.platform()  # uname/registry lookup, constant per run
 
         self._build_ui()
         self._start_sampling_thread()
-        self._tick_ui()
 
     def _build_ui(self):
         # Top frame: status
@@ -277,10 +309,12 @@ class BatteryManagerApp:
         self.btn_dim = ttk.Button(actions, text="Dim brightness", command=self.on_dim)
         self.btn_wifi = ttk.Button(actions, text="Toggle Wi‑Fi", command=self.on_wifi)
         self.btn_tips = ttk.Button(actions, text="Quick tips", command=self.on_tips)
+        self.btn_save_log = ttk.Button(actions, text="Save log", command=self.on_save_log)
 
         self.btn_dim.grid(row=0, column=0, padx=5, pady=2)
         self.btn_wifi.grid(row=0, column=1, padx=5, pady=2)
         self.btn_tips.grid(row=0, column=2, padx=5, pady=2)
+        self.btn_save_log.grid(row=0, column=3, padx=5, pady=2)
 
         # Notebook: Logs and AI
         nb = ttk.Notebook(self.root)
@@ -318,21 +352,37 @@ class BatteryManagerApp:
 
     # ---------- Event handlers ----------
 
+    def _run_async(self, fn, on_done):
+        # Run a blocking action off the Tk thread and hand its result back via after()
+        def worker():
+            result = fn()
+            self.root.after(0, on_done, result)
+        threading.Thread(target=worker, daemon=True).start()
+
     def on_dim(self):
-        ok, msg = dim_brightness_best_effort()
+        self._run_async(dim_brightness_best_effort, self._after_dim)
+
+    def _after_dim(self, result):
+        ok, msg = result
         self._append_log(f"[ACTION] Dim brightness: {msg}")
         if not ok:
             messagebox.showinfo(APP_NAME, msg)
 
     def on_wifi(self):
-        ok, msg = toggle_wifi_best_effort()
+        self._run_async(toggle_wifi_best_effort, self._after_wifi)
+
+    def _after_wifi(self, result):
+        ok, msg = result
         self._append_log(f"[ACTION] Toggle Wi‑Fi: {msg}")
         if not ok:
             messagebox.showinfo(APP_NAME, msg)
 
     def on_tips(self):
-        bp, plugged, secs = get_battery_info()
-        cpu = get_cpu_percent()
+        with self._sample_lock:
+            s = self._last_sample
+        bp = s.get("battery_percent")
+        plugged = s.get("power_plugged")
+        cpu = s.get("cpu_percent")
         tips = []
 
         if plugged is False:
@@ -347,6 +397,21 @@ class BatteryManagerApp:
         self._append_log("[TIPS]\n" + text)
         messagebox.showinfo(APP_NAME, text)
 
+    def on_save_log(self):
+        path = filedialog.asksaveasfilename(defaultextension=".log", filetypes=[("Log", "*.log"), ("Text", "*.txt")])
+        if not path:
+            return
+        try:
+            self.export_log(path)
+            self._append_log(f"[ACTION] Log saved: {path}")
+        except OSError as e:
+            messagebox.showerror(APP_NAME, f"Couldn’t save log: {e}")
+
+    def export_log(self, path):
+        # Stream entries through the buffered file; no joined copy of the whole log
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in self.log_lines)
+
     def on_ask_ai(self):
         ctx = self._current_context()
         user_prompt = self.txt_prompt.get("1.0", "end").strip()
@@ -362,10 +427,10 @@ class BatteryManagerApp:
             try:
                 reply = backend_contract_llm(ctx, user_prompt)
                 self.root.after(0, lambda: self._set_reply(reply))
-                self._append_log("[AI] Prompt sent.")
+                self.root.after(0, self._append_log, "[AI] Prompt sent.")
             except Exception as e:
                 self.root.after(0, lambda: self._set_reply(f"Error: {e}"))
-                self._append_log(f"[AI] Error: {e}")
+                self.root.after(0, self._append_log, f"[AI] Error: {e}")
 
         threading.Thread(target=worker, daemon=True).start()
 
@@ -373,31 +438,46 @@ class BatteryManagerApp:
 
     def _start_sampling_thread(self):
         def sampler():
+            # CPU is read every tick, the battery only every BATTERY_INTERVAL_SEC
+            batt = (None, None, None)
+            next_batt = 0.0
+            shown = None
             while self.running:
-                bp, plugged, secs = get_battery_info()
+                now = time.monotonic()
+                if now >= next_batt:
+                    batt = get_battery_info()
+                    next_batt = now + BATTERY_INTERVAL_SEC
+                bp, plugged, secs = batt
                 cpu = get_cpu_percent()
-                self.sample_queue.put({
+                sample = {
                     "ts": time.time(),
                     "battery_percent": bp,
                     "power_plugged": plugged,
                     "secs_left": secs,
                     "cpu_percent": cpu
-                })
-                time.sleep(SAMPLE_INTERVAL_SEC)
+                }
+                # Publish to the UI/log only on a meaningful change or every SAMPLE_INTERVAL_SEC
+                publish = (shown is None or sample["ts"] - shown["ts"] >= SAMPLE_INTERVAL_SEC
+                           or _sample_changed(shown, sample))
+                with self._sample_lock:
+                    self._last_sample = sample
+                    # Wake the Tk thread only if no sample is already waiting for it
+                    wake = publish and self._latest is None
+                    if publish:
+                        self._latest = sample
+                if publish:
+                    shown = sample
+                if wake and self.running:
+                    self.root.after(0, self._show_latest)
+                time.sleep(CPU_INTERVAL_SEC)
         threading.Thread(target=sampler, daemon=True).start()
 
-    def _tick_ui(self):
-        # Drain queue
-        try:
-            while True:
-                item = self.sample_queue.get_nowait()
-                self._apply_sample(item)
-        except Empty:
-            pass
-
-        # Schedule next UI tick
-        if self.running:
-            self.root.after(500, self._tick_ui)
+    def _show_latest(self):
+        # Only the newest pending sample is worth drawing
+        with self._sample_lock:
+            s, self._latest = self._latest, None
+        if s is not None:
+            self._append_log(self._apply_sample(s))
 
     def _apply_sample(self, s):
         bp = s.get("battery_percent")
@@ -405,21 +485,29 @@ class BatteryManagerApp:
         secs = s.get("secs_left")
         cpu = s.get("cpu_percent")
 
-        # Update labels
-        self.lbl_battery.configure(text=f"Battery: {bp:.0f}%" if bp is not None else "Battery: -")
-        self.lbl_power.configure(text=f"Power: {'Plugged' if plugged else 'Battery' if plugged is not None else '-'}")
-        self.lbl_timeleft.configure(text=f"Time left: {self._fmt_secs(secs)}")
-        self.lbl_cpu.configure(text=f"CPU: {cpu:.0f}%" if cpu is not None else "CPU: -")
-
-        # Update progress bar
-        if bp is not None:
-            self.pb_battery["value"] = float(bp)
-        else:
-            self.pb_battery["value"] = 0
-
-        # Log sample
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self._append_log(f"[{ts}] Battery={bp}%, Plugged={plugged}, TimeLeft={self._fmt_secs(secs)}, CPU={cpu}%")
+        # Update labels and progress bar, touching only widgets whose value changed
+        shown = self._last_displayed
+        updates = (
+            ("battery", self.lbl_battery, _BATT_UNK if bp is None else "Battery: %.0f%%" % bp),
+            ("power", self.lbl_power, _POWER_TEXT[plugged]),
+            ("timeleft", self.lbl_timeleft, "Time left: " + self._fmt_secs(secs)),
+            ("cpu", self.lbl_cpu, _CPU_UNK if cpu is None else "CPU: %.0f%%" % cpu),
+        )
+        for key, label, text in updates:
+            if shown.get(key) != text:
+                label.configure(text=text)
+                shown[key] = text
+
+        value = float(bp) if bp is not None else 0
+        if shown.get("progress") != value:
+            self.pb_battery["value"] = value
+            shown["progress"] = value
+
+        # Log line for this sample
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+        return f"[{self._ts_cache[1]}] Battery={bp}%, Plugged={plugged}, TimeLeft={self._fmt_secs(secs)}, CPU={cpu}%"
 
     def _fmt_secs(self, s):
         if s is None or s < 0:
@@ -429,14 +517,14 @@ class BatteryManagerApp:
         return f"{h}h {m}m"
 
     def _current_context(self):
-        bp, plugged, secs = get_battery_info()
-        cpu = get_cpu_percent()
+        with self._sample_lock:
+            s = self._last_sample
         return {
-            "battery_percent": bp,
-            "power_plugged": plugged,
-            "secs_left": secs,
-            "cpu_percent": cpu,
-            "platform": platform.platform(),
+            "battery_percent": s.get("battery_percent"),
+            "power_plugged": s.get("power_plugged"),
+            "secs_left": s.get("secs_left"),
+            "cpu_percent": s.get("cpu_percent"),
+            "platform": self._platform_str,
             "timestamp": datetime.now().isoformat(timespec="seconds")
         }
 
@@ -458,11 +546,13 @@ class BatteryManagerApp:
 
     def _append_log(self, line: str):
         self.log_lines.append(line)
-        if len(self.log_lines) > LOG_MAX_LINES:
-            self.log_lines = self.log_lines[-LOG_MAX_LINES:]
+        # Append only the new text and trim the oldest widget lines past the cap
         self.txt_logs.configure(state="normal")
-        self.txt_logs.delete("1.0", "end")
-        self.txt_logs.insert("1.0", "\n".join(self.log_lines))
+        self.txt_logs.insert("end", line + "\n")
+        lines = int(self.txt_logs.index("end-1c").split(".")[0])
+        if lines > LOG_MAX_LINES:
+            self.txt_logs.delete("1.0", f"{lines - LOG_MAX_LINES}.0")
+        self.txt_logs.see("end")
         self.txt_logs.configure(state="disabled")
 
     def on_close(self):
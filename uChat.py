@@ -15,6 +15,9 @@ class ChatApp:
             bg="#f5f5f5", fg="black", font=("Arial", 11)
         )
         self.chat_area.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+        self.chat_area.tag_config("bold", font=("Arial", 10, "bold"))
+        self.chat_area.tag_config("blue", foreground="blue")
+        self.chat_area.tag_config("green", foreground="darkgreen")
 
         # Message entry box
         self.entry_frame = tk.Frame(root, bg="#ddd")
@@ -45,9 +48,6 @@ class ChatApp:
         timestamp = datetime.now().strftime("%H:%M")
         self.chat_area.insert(tk.END, f"{sender} ({timestamp}):\n", ("bold",))
         self.chat_area.insert(tk.END, f"{msg}\n\n", (color,))
-        self.chat_area.tag_config("bold", font=("Arial", 10, "bold"))
-        self.chat_area.tag_config("blue", foreground="blue")
-        self.chat_area.tag_config("green", foreground="darkgreen")
         self.chat_area.config(state="disabled")
         self.chat_area.yview(tk.END)
 
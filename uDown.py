@@ -1,16 +1,22 @@
 import tkinter as tk
 from tkinter import messagebox
 from pytube import YouTube
-from pydub import AudioSegment
-import os
+import shutil
+import tempfile
+import subprocess
+import threading
 import requests
 
+# Keep-alive session reused across title cleanups
+_SESSION = requests.Session()
+
 # Optional: AI title cleaner
 def clean_title_with_ai(title):
     try:
-        response = requests.post(
+        response = _SESSION.post(
             "http://localhost:11434/api/generate",  # Replace with your LLM endpoint
-            json={"model": "llama3", "prompt": f"Clean this YouTube title for saving as MP3: {title}", "stream": False}
+            json={"model": "llama3", "prompt": f"Clean this YouTube title for saving as MP3: {title}", "stream": False},
+            timeout=(2, 10)
         )
         return response.json()["response"].strip()
     except:
@@ -18,18 +24,34 @@ def clean_title_with_ai(title):
 
 def download_mp3():
     url = url_entry.get()
+    # Network, parsing and encoding all run off the Tk thread; one job at a time
+    download_btn.config(state="disabled")
+    threading.Thread(target=_download_worker, args=(url,), daemon=True).start()
+
+def _download_worker(url):
+    # Each job gets its own temp dir so its audio file can't be clobbered
+    tmp_dir = tempfile.mkdtemp(prefix="udown_")
     try:
         yt = YouTube(url)
         title = yt.title
         cleaned_title = clean_title_with_ai(title)
         stream = yt.streams.filter(only_audio=True).first()
-        out_file = stream.download(filename="temp_audio")
+        out_file = stream.download(output_path=tmp_dir, filename="temp_audio")
         mp3_file = f"{cleaned_title}.mp3"
-        AudioSegment.from_file(out_file).export(mp3_file, format="mp3")
-        os.remove(out_file)
-        messagebox.showinfo("Success", f"Downloaded: {mp3_file}")
+        # ffmpeg streams the re-encode; no full decode into memory
+        subprocess.run(["ffmpeg", "-y", "-i", out_file, "-vn", "-c:a", "libmp3lame", "-q:a", "2", mp3_file],
+                       check=True, capture_output=True)
+        root.after(0, lambda: messagebox.showinfo("Success", f"Downloaded: {mp3_file}"))
     except Exception as e:
-        messagebox.showerror("Error", str(e))
+        err = str(e)
+        if isinstance(e, subprocess.CalledProcessError) and e.stderr:
+            # ffmpeg's last lines say what actually went wrong
+            tail = e.stderr.decode("utf-8", "replace").strip().splitlines()[-5:]
+            err += "\n\n" + "\n".join(tail)
+        root.after(0, lambda: messagebox.showerror("Error", err))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        root.after(0, lambda: download_btn.config(state="normal"))
 
 # GUI setup
 root = tk.Tk()
@@ -39,6 +61,7 @@ tk.Label(root, text="YouTube URL:").pack(pady=5)
 url_entry = tk.Entry(root, width=50)
 url_entry.pack(pady=5)
 
-tk.Button(root, text="Download MP3", command=download_mp3).pack(pady=10)
+download_btn = tk.Button(root, text="Download MP3", command=download_mp3)
+download_btn.pack(pady=10)
 
 root.mainloop()
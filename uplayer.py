@@ -4,30 +4,59 @@
 
 import os
 import re
+import functools
+import queue
 import sys
 import threading
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk
 
-try:
-    import vlc
-except ImportError:
-    raise RuntimeError("python-vlc is required. Install with: pip install python-vlc")
+SLIDER_DEBOUNCE_MS = 30
+CONSOLE_MAX_LINES = 500
+# Seeks closer than this to the current position are dropped; VLC would flush
+# its decoder buffers (a visible stutter) for no change.
+SEEK_DEADBAND_MS = 250
 
 
 class VideoPlayer:
     def __init__(self, root):
         self.root = root
+        # Imported here so using LocalParser alone doesn't load libvlc
+        try:
+            import vlc
+        except ImportError:
+            raise RuntimeError("python-vlc is required. Install with: pip install python-vlc")
         self.instance = vlc.Instance()
         self.player = self.instance.media_player_new()
+        # Pick the window-handle setter for this platform once
+        if sys.platform.startswith("win"):
+            self._attach_fn = self.player.set_hwnd
+        elif sys.platform.startswith("linux"):
+            self._attach_fn = self.player.set_xwindow
+        elif sys.platform == "darwin":
+            self._attach_fn = self.player.set_nsobject
+        else:
+            self._attach_fn = None
         self.media = None
+        self._length_ms = 0
+        self._time_ms = 0
+        self._vol_job = self._speed_job = self._seek_job = None
+        self._seeking = False
+        self._applied_rate = 1.0
+        self._last_vol = None
+        self._last_mute = None
+        self._log_q = queue.SimpleQueue()
+        self._log_scheduled = False
+        self._last_time_text = None
 
         self.is_fullscreen = False
         self._build_ui()
         self._bind_events()
 
-        # Timer to update time labels/slider
-        self._update_ui_timer()
+        # Time label/slider follow VLC's own time/length events instead of polling
+        em = self.player.event_manager()
+        em.event_attach(vlc.EventType.MediaPlayerTimeChanged, self._on_vlc_time)
+        em.event_attach(vlc.EventType.MediaPlayerLengthChanged, self._on_vlc_length)
 
     def _build_ui(self):
         self.root.title("LLM Video Player (Tk + VLC)")
@@ -44,8 +73,8 @@ class VideoPlayer:
         self.right.pack(side="right", fill="y")
         self.right.pack_propagate(False)
 
-        # Video panel
-        self.video_panel = tk.Canvas(self.left, background="#000000", highlightthickness=0)
+        # Video panel: VLC only needs a native window handle, so a plain Frame is enough
+        self.video_panel = tk.Frame(self.left, background="#000000")
         self.video_panel.pack(fill="both", expand=True)
 
         # Playback controls
@@ -72,6 +101,9 @@ class VideoPlayer:
         self.seek_slider = ttk.Scale(self.time_frame, orient="horizontal", variable=self.seek_var,
                                      from_=0.0, to=1000.0, command=self._on_seek_slider)
         self.seek_slider.pack(side="left", fill="x", expand=True, padx=6)
+        # While dragging, playback updates must not move the slider under the user
+        self.seek_slider.bind("<ButtonPress-1>", lambda e: setattr(self, "_seeking", True))
+        self.seek_slider.bind("<ButtonRelease-1>", self._on_seek_release)
 
         # Volume/speed
         vs_frame = ttk.Frame(self.left)
@@ -99,14 +131,15 @@ class VideoPlayer:
         ttk.Label(self.right, text="Command").pack(anchor="w", padx=8, pady=(8, 2))
         self.cmd_entry = tk.Text(self.right, height=5, wrap="word")
         self.cmd_entry.pack(fill="x", padx=8)
-        self.btn_run_cmd = ttk.Button(self.right, text="Run", command=self.run_command_async)
+        # The command is wired up by App, which owns the parser and executor
+        self.btn_run_cmd = ttk.Button(self.right, text="Run")
         self.btn_run_cmd.pack(padx=8, pady=(6, 10), anchor="e")
 
         ttk.Label(self.right, text="Console").pack(anchor="w", padx=8)
         self.console = tk.Text(self.right, height=20, state="disabled", wrap="word")
         self.console.pack(fill="both", expand=True, padx=8, pady=(2, 8))
 
-        # Attach VLC to Tk canvas
+        # Attach VLC to the video frame
         self.root.after(100, self._attach_player)
 
     def _bind_events(self):
@@ -114,21 +147,20 @@ class VideoPlayer:
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def _attach_player(self):
-        handle = self.video_panel.winfo_id()
-        if sys.platform.startswith("win"):
-            self.player.set_hwnd(handle)
-        elif sys.platform.startswith("linux"):
-            self.player.set_xwindow(handle)
-        elif sys.platform == "darwin":
-            self.player.set_nsobject(handle)
+        # Make sure the frame's native window exists before handing it to VLC
+        self.video_panel.update_idletasks()
+        if self._attach_fn is not None:
+            self._attach_fn(self.video_panel.winfo_id())
         # Set initial volume
-        self.player.audio_set_volume(self.vol_var.get())
+        self._last_vol = self.vol_var.get()
+        self.player.audio_set_volume(self._last_vol)
 
     def _resize_video(self):
         # VLC handles scaling; no-op but kept for future custom behaviors
         pass
 
     def open_file_dialog(self):
+        from tkinter import filedialog
         path = filedialog.askopenfilename(
             title="Open video",
             filetypes=[("Video files", "*.mp4;*.mkv;*.avi;*.mov;*.webm;*.ts;*.flv;*.wmv;*.m4v"), ("All files", "*.*")]
@@ -140,21 +172,28 @@ class VideoPlayer:
         try:
             self.media = self.instance.media_new(path_or_url)
             self.player.set_media(self.media)
+            # Cleared until VLC reports the new media's LengthChanged; the
+            # position too, so the seek deadband doesn't use the old file's
+            self._length_ms = 0
+            self._time_ms = 0
             self.play()
             self._log(f"Opened: {path_or_url}")
         except Exception as e:
+            from tkinter import messagebox
             messagebox.showerror("Open media failed", str(e))
             self._log(f"Error: {e}")
 
     def play(self):
         try:
             self.player.play()
-            # Apply current speed
+            # Apply current speed, unless VLC already has it
             rate = self.speed_var.get()
-            try:
-                self.player.set_rate(rate)
-            except Exception:
-                pass
+            if rate != self._applied_rate:
+                try:
+                    self.player.set_rate(rate)
+                    self._applied_rate = rate
+                except Exception:
+                    pass
         except Exception as e:
             self._log(f"Play error: {e}")
 
@@ -167,71 +206,149 @@ class VideoPlayer:
     def stop(self):
         try:
             self.player.stop()
+            self._time_ms = 0
         except Exception as e:
             self._log(f"Stop error: {e}")
 
     def toggle_mute(self):
         try:
             self.player.audio_toggle_mute()
+            self._last_mute = None
         except Exception as e:
             self._log(f"Mute error: {e}")
 
+    def set_mute(self, mute):
+        if mute == self._last_mute:
+            return
+        try:
+            self.player.audio_set_mute(mute)
+            self._last_mute = mute
+        except Exception as e:
+            self._log(f"Mute error: {e}")
+
+    def seek_to(self, ms):
+        if abs(ms - self._time_ms) < SEEK_DEADBAND_MS:
+            return
+        try:
+            self.player.set_time(ms)
+        except Exception as e:
+            self._log(f"Seek error: {e}")
+
     def toggle_fullscreen(self):
         self.is_fullscreen = not self.is_fullscreen
         self.root.attributes("-fullscreen", self.is_fullscreen)
 
+    # Slider callbacks fire on every pixel of a drag; each one only schedules a
+    # flush, which applies the slider's latest value to VLC at most every 30 ms.
     def _on_volume_change(self, _value):
-        v = int(float(self.vol_slider.get()))
+        if self._vol_job is None:
+            self._vol_job = self.root.after(SLIDER_DEBOUNCE_MS, self._flush_volume)
+
+    def _flush_volume(self):
+        self._vol_job = None
+        v = round(self.vol_slider.get())
         self.vol_var.set(v)
+        if v == self._last_vol:
+            return
         try:
             self.player.audio_set_volume(v)
+            self._last_vol = v
         except Exception as e:
             self._log(f"Volume error: {e}")
 
     def _on_speed_change(self, _value):
+        if self._speed_job is None:
+            self._speed_job = self.root.after(SLIDER_DEBOUNCE_MS, self._flush_speed)
+
+    def _flush_speed(self):
+        self._speed_job = None
         rate = float(self.speed_slider.get())
         self.speed_var.set(rate)
+        if rate == self._applied_rate:
+            return
         try:
             self.player.set_rate(rate)
+            self._applied_rate = rate
         except Exception as e:
             self._log(f"Speed error: {e}")
 
     def _on_seek_slider(self, _value):
+        if self._seek_job is None:
+            self._seek_job = self.root.after(SLIDER_DEBOUNCE_MS, self._flush_seek)
+
+    def _on_seek_release(self, _event):
+        if self._seek_job is not None:
+            self.root.after_cancel(self._seek_job)
+            self._flush_seek()
+        self._seeking = False
+
+    def _flush_seek(self):
+        self._seek_job = None
         # Slider is 0..1000; map to duration
-        length_ms = self.player.get_length()
+        length_ms = self._length_ms
         if length_ms > 0:
             pos = self.seek_var.get() / 1000.0
-            new_time = int(length_ms * pos)
-            try:
-                self.player.set_time(new_time)
-            except Exception as e:
-                self._log(f"Seek error: {e}")
+            self.seek_to(int(length_ms * pos))
 
-    def _format_time(self, ms):
-        if ms < 0:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _format_time(sec):
+        # Whole seconds in, so each distinct string is formatted once
+        if sec < 0:
             return "00:00"
-        s = int(ms // 1000)
-        m, s = divmod(s, 60)
+        m, s = divmod(sec, 60)
         h, m = divmod(m, 60)
         if h > 0:
             return f"{h:02d}:{m:02d}:{s:02d}"
         return f"{m:02d}:{s:02d}"
 
-    def _update_ui_timer(self):
-        try:
-            length = self.player.get_length()
-            current = self.player.get_time()
-            if length > 0:
-                pos = max(0.0, min(1.0, current / length))
-                self.seek_var.set(pos * 1000.0)
-            self.lbl_time.config(text=f"{self._format_time(current)} / {self._format_time(length)}")
-        except Exception:
-            pass
-        self.root.after(200, self._update_ui_timer)
+    def _on_vlc_time(self, event):
+        # Called on a VLC thread; hand the value to the Tk thread
+        self.root.after_idle(self._apply_time, event.u.new_time)
+
+    def _on_vlc_length(self, event):
+        self.root.after_idle(self._apply_length, event.u.new_length)
+
+    def _apply_length(self, length):
+        self._length_ms = length
+        self._apply_time(self._time_ms)
+
+    def _apply_time(self, current):
+        self._time_ms = current
+        length = self._length_ms
+        if length > 0 and not self._seeking:
+            pos = max(0.0, min(1.0, current / length))
+            self.seek_var.set(pos * 1000.0)
+        text = f"{self._format_time(int(current // 1000))} / {self._format_time(int(length // 1000))}"
+        if text != self._last_time_text:
+            self._last_time_text = text
+            self.lbl_time.config(text=text)
 
     def _log(self, text):
+        # Safe from any thread: lines are queued and written by the Tk thread
+        self._log_q.put(text)
+        # One drain per idle tick, however many lines arrive before it runs
+        if not self._log_scheduled:
+            self._log_scheduled = True
+            self.root.after_idle(self._drain_log)
+
+    def _drain_log(self):
+        # Cleared before draining so a line queued meanwhile schedules a new drain
+        self._log_scheduled = False
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_q.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
         self.console.config(state="normal")
-        self.console.insert("end", text + "\n")
+        self.console.insert("end", "\n".join(lines) + "\n")
+        # Keep the console bounded so inserts don't slow down over a long session
+        lines = int(self.console.index("end-1c").split(".")[0])
+        if lines > CONSOLE_MAX_LINES:
+            self.console.delete("1.0", f"{lines - CONSOLE_MAX_LINES}.0")
         self.console.see("end")
         self.console.config(state="disabled")
 
@@ -252,7 +369,7 @@ class LLMClient:
     Plug your LLM provider inside call_llm() and return a normalized intent dict.
     For example:
       - {"action": "open", "target": "C:\\video.mp4"}
-      - {"action": "seek", "seconds": 10, "direction": "forward"}
+      - {"action": "seek", "delta_ms": 10000}  (negative to seek backward)
       - {"action": "volume", "value": 70}
       - {"action": "speed", "value": 1.25}
       - {"action": "play"} | {"action": "pause"} | {"action": "stop"}
@@ -260,14 +377,8 @@ class LLMClient:
     """
     def __init__(self):
         self.enabled = bool(os.environ.get("LLM_ENABLED", "").strip())
-
-    def parse(self, text: str) -> dict:
-        """
-        If LLM enabled, use it; otherwise use the local parser.
-        """
-        if self.enabled:
-            return self.call_llm(text)
-        return LocalParser.parse(text)
+        # If LLM enabled, use it; otherwise use the local parser. Decided once here.
+        self.parse = self.call_llm if self.enabled else LocalParser.parse
 
     def call_llm(self, text: str) -> dict:
         """
@@ -283,69 +394,87 @@ class LLMClient:
         return LocalParser.parse(text)
 
 
+def _strip_target(target):
+    return target.strip().strip('"').strip("'")
+
+
+def _clamp(value, lo, hi):
+    # Only the parser needs this; the sliders are already bounded by from_/to
+    return lo if value < lo else hi if value > hi else value
+
+
 class LocalParser:
     """
     Fast, deterministic parser that supports concise commands and natural phrases.
     """
-    OPEN_PATTERNS = [
-        r"open\s+(?P<target>.+)$",
-        r"play\s+(?P<target>https?://\S+)",
-    ]
-
-    @staticmethod
-    def parse(text: str) -> dict:
-        t = text.strip().lower()
-
+    # One compiled alternation for every command. Each branch is a lookahead anchored
+    # at the start, so branches are tried in priority order (the first command found
+    # anywhere in the text wins) and m.lastgroup names the branch that matched.
+    BRANCHES = (
         # Open file/url
-        for pat in LocalParser.OPEN_PATTERNS:
-            m = re.search(pat, t, flags=re.IGNORECASE)
-            if m:
-                target = m.group("target").strip().strip('"').strip("'")
-                return {"action": "open", "target": target}
-
+        ("open", r"open\s+(?P<open_target>.+)$"),
+        ("open_url", r"play\s+(?P<url_target>https?://\S+)"),
         # Play / Pause / Stop
-        if re.search(r"\bplay\b", t):
-            return {"action": "play"}
-        if re.search(r"\bpause\b", t):
-            return {"action": "pause"}
-        if re.search(r"\bstop\b", t):
-            return {"action": "stop"}
-
+        ("play", r"\bplay\b"),
+        ("pause", r"\bpause\b"),
+        ("stop", r"\bstop\b"),
         # Seek forward/backward N seconds or to mm:ss
-        m = re.search(r"(seek|skip|jump)\s+(forward|ahead|back|backward)?\s*(?P<sec>\d+)\s*(sec|second|seconds)?", t)
-        if m:
-            sec = int(m.group("sec"))
-            direction = m.group(2) or "forward"
-            return {"action": "seek", "seconds": sec, "direction": direction}
-
-        m = re.search(r"(seek|go to|jump to)\s+(?P<mm>\d{1,2}):(?P<ss>\d{2})", t)
-        if m:
-            mm = int(m.group("mm"))
-            ss = int(m.group("ss"))
-            return {"action": "seek_to", "ms": (mm * 60 + ss) * 1000}
-
+        ("seek", r"(seek|skip|jump)\s+(?P<seek_dir>forward|ahead|back|backward)?\s*(?P<sec>\d+)\s*(sec|second|seconds)?"),
+        ("seek_to", r"(seek|go to|jump to)\s+(?P<mm>\d{1,2}):(?P<ss>\d{2})"),
         # Volume
-        m = re.search(r"(vol|volume)\s*(to|=)?\s*(?P<val>\d{1,3})", t)
-        if m:
-            val = max(0, min(100, int(m.group("val"))))
-            return {"action": "volume", "value": val}
-        if re.search(r"\bmute\b", t):
-            return {"action": "mute"}
-        if re.search(r"\bunmute\b", t):
-            return {"action": "unmute"}
-
+        ("volume", r"(vol|volume)\s*(to|=)?\s*(?P<vol>\d{1,3})"),
+        ("mute", r"\bmute\b"),
+        ("unmute", r"\bunmute\b"),
         # Speed
-        m = re.search(r"(speed|rate)\s*(to|=)?\s*(?P<val>\d+(\.\d+)?)", t)
-        if m:
-            val = float(m.group("val"))
-            return {"action": "speed", "value": max(0.25, min(3.0, val))}
-
+        ("speed", r"(speed|rate)\s*(to|=)?\s*(?P<rate>\d+(\.\d+)?)"),
         # Fullscreen/windowed
-        if re.search(r"\bfullscreen\b", t):
-            return {"action": "fullscreen"}
-        if re.search(r"\bwindow(ed)?\b", t):
-            return {"action": "windowed"}
+        ("fullscreen", r"\bfullscreen\b"),
+        ("windowed", r"\bwindow(ed)?\b"),
+    )
+    COMMAND_RE = re.compile(
+        "^(?:" + "|".join(rf"(?=(?P<{name}>[\s\S]*?{pat}))" for name, pat in BRANCHES) + ")"
+    )
+    HANDLERS = {
+        "open": lambda m: {"action": "open", "target": _strip_target(m.group("open_target"))},
+        "open_url": lambda m: {"action": "open", "target": _strip_target(m.group("url_target"))},
+        "play": lambda m: {"action": "play"},
+        "pause": lambda m: {"action": "pause"},
+        "stop": lambda m: {"action": "stop"},
+        "seek": lambda m: {"action": "seek",
+                           "delta_ms": int(m.group("sec")) * (-1000 if m.group("seek_dir") in ("back", "backward") else 1000)},
+        "seek_to": lambda m: {"action": "seek_to", "ms": (int(m.group("mm")) * 60 + int(m.group("ss"))) * 1000},
+        "volume": lambda m: {"action": "volume", "value": _clamp(int(m.group("vol")), 0, 100)},
+        "mute": lambda m: {"action": "mute"},
+        "unmute": lambda m: {"action": "unmute"},
+        "speed": lambda m: {"action": "speed", "value": _clamp(float(m.group("rate")), 0.25, 3.0)},
+        "fullscreen": lambda m: {"action": "fullscreen"},
+        "windowed": lambda m: {"action": "windowed"},
+    }
+
+    # Bare one-word commands skip the regex entirely; executors only read intents
+    LITERALS = {
+        "play": {"action": "play"},
+        "pause": {"action": "pause"},
+        "stop": {"action": "stop"},
+        "mute": {"action": "mute"},
+        "unmute": {"action": "unmute"},
+        "fullscreen": {"action": "fullscreen"},
+        "window": {"action": "windowed"},
+        "windowed": {"action": "windowed"},
+    }
 
+    @staticmethod
+    def parse(text: str) -> dict:
+        t = text.strip().lower()
+        hit = LocalParser.LITERALS.get(t)
+        if hit is not None:
+            return hit
+        # A single-line "open <target>" is the open branch by construction; slice it
+        if t.startswith("open ") and "\n" not in t:
+            return {"action": "open", "target": _strip_target(t[5:])}
+        m = LocalParser.COMMAND_RE.search(t)
+        if m:
+            return LocalParser.HANDLERS[m.lastgroup](m)
         return {"action": "unknown", "raw": text}
 
 # --- Command executor ---
@@ -353,50 +482,55 @@ class LocalParser:
 class CommandExecutor:
     def __init__(self, player: VideoPlayer):
         self.player = player
+        self._dispatch = {
+            "open": self._do_open,
+            "play": lambda intent: self.player.play(),
+            "pause": lambda intent: self.player.pause(),
+            "stop": lambda intent: self.player.stop(),
+            "seek": self._do_seek,
+            "seek_to": self._do_seek_to,
+            "volume": self._do_volume,
+            "mute": lambda intent: self.player.set_mute(True),
+            "unmute": lambda intent: self.player.set_mute(False),
+            "speed": self._do_speed,
+            "fullscreen": lambda intent: self._do_fullscreen(True),
+            "windowed": lambda intent: self._do_fullscreen(False),
+        }
 
     def execute(self, intent: dict):
-        action = intent.get("action")
-        if action == "open":
-            target = intent.get("target")
-            if target:
-                self.player.open_media(target)
-            else:
-                self.player._log("No target found for open.")
-        elif action == "play":
-            self.player.play()
-        elif action == "pause":
-            self.player.pause()
-        elif action == "stop":
-            self.player.stop()
-        elif action == "seek":
-            seconds = intent.get("seconds", 0)
-            direction = intent.get("direction", "forward")
-            cur = self.player.player.get_time()
-            delta = seconds * 1000 * (1 if direction.startswith("for") or direction.startswith("ahead") else -1)
-            self.player.player.set_time(max(0, cur + delta))
-        elif action == "seek_to":
-            ms = intent.get("ms", 0)
-            self.player.player.set_time(ms)
-        elif action == "volume":
-            val = intent.get("value", 80)
-            self.player.vol_slider.set(val)
-            self.player._on_volume_change(val)
-        elif action == "mute":
-            self.player.player.audio_set_mute(True)
-        elif action == "unmute":
-            self.player.player.audio_set_mute(False)
-        elif action == "speed":
-            val = intent.get("value", 1.0)
-            self.player.speed_slider.set(val)
-            self.player._on_speed_change(val)
-        elif action == "fullscreen":
-            if not self.player.is_fullscreen:
-                self.player.toggle_fullscreen()
-        elif action == "windowed":
-            if self.player.is_fullscreen:
-                self.player.toggle_fullscreen()
+        handler = self._dispatch.get(intent.get("action"), self._do_unknown)
+        handler(intent)
+
+    def _do_open(self, intent):
+        target = intent.get("target")
+        if target:
+            self.player.open_media(target)
         else:
-            self.player._log(f"Unknown command: {intent.get('raw', '')}")
+            self.player._log("No target found for open.")
+
+    def _do_seek(self, intent):
+        # The parser has already folded the direction into a signed offset
+        self.player.seek_to(max(0, self.player.player.get_time() + intent.get("delta_ms", 0)))
+
+    def _do_seek_to(self, intent):
+        self.player.seek_to(intent.get("ms", 0))
+
+    def _do_volume(self, intent):
+        val = intent.get("value", 80)
+        self.player.vol_slider.set(val)
+        self.player._on_volume_change(val)
+
+    def _do_speed(self, intent):
+        val = intent.get("value", 1.0)
+        self.player.speed_slider.set(val)
+        self.player._on_speed_change(val)
+
+    def _do_fullscreen(self, want):
+        if self.player.is_fullscreen != want:
+            self.player.toggle_fullscreen()
+
+    def _do_unknown(self, intent):
+        self.player._log(f"Unknown command: {intent.get('raw', '')}")
 
 
 # --- App wiring ---
@@ -407,13 +541,22 @@ class App:
         self.player = VideoPlayer(self.root)
         self.llm = LLMClient()
         self.exec = CommandExecutor(self.player)
+        self.player.btn_run_cmd.config(command=self.run_command_async)
+
+        # One long-lived worker handles every command instead of a thread per Run
+        self._cmd_q = queue.SimpleQueue()
+        threading.Thread(target=self._command_worker, daemon=True).start()
 
     def run_command_async(self):
         text = self.player.cmd_entry.get("1.0", "end").strip()
         if not text:
             return
         self.player._log(f"> {text}")
-        threading.Thread(target=self._process_command, args=(text,), daemon=True).start()
+        self._cmd_q.put(text)
+
+    def _command_worker(self):
+        while True:
+            self._process_command(self._cmd_q.get())
 
     def _process_command(self, text: str):
         try:
@@ -11,20 +11,27 @@ Dependencies (optional):
 - psutil (for graceful shutdown intent and system info) -> pip install psutil
 - pywin32 (for WMI fallback on Windows) -> pip install pywin32
 - requests (for LLM calls) -> pip install requests
+- numba (compiles the alert evaluation) -> pip install numba
+- orjson (faster JSON for LLM requests) -> pip install orjson
 
 All dependencies are optional; app runs with basic features without them.
 """
 
 import os
+import re
+import hashlib
 import sys
+import socket
+import shutil
 import time
 import json
-import queue
 import threading
 import subprocess
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
@@ -45,12 +52,22 @@ try:
 except Exception:
     requests = None
 
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
 
 # ------------------------------
 # Configuration and thresholds
 # ------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     poll_interval_sec: int = 5
     low_battery_threshold_pct: int = 25
@@ -69,13 +86,14 @@ class AppConfig:
     # Behavior
     allow_shutdown_actions: bool = False # guard to prevent actual shutdown without explicit enable
     log_capacity: int = 1000
+    keep_raw: bool = False               # keep the full probe output on each UPSStatus (debugging)
 
 
 # ------------------------------
 # UPS status model
 # ------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class UPSStatus:
     source: str = "unknown"   # nut/apcupsd/wmi/unknown
     on_battery: Optional[bool] = None
@@ -85,7 +103,7 @@ class UPSStatus:
     voltage_out: Optional[float] = None
     load_pct: Optional[float] = None
     status_text: str = ""
-    raw: Dict[str, Any] = field(default_factory=dict)
+    raw: Optional[Dict[str, Any]] = None   # only filled when cfg.keep_raw
     timestamp: float = field(default_factory=time.time)
 
 
@@ -93,47 +111,139 @@ class UPSStatus:
 # Probers for NUT and APCUPSD
 # ------------------------------
 
+# "key: value" lines from upsc/apcaccess, whitespace around both sides trimmed.
+# [ \t] rather than \s so an empty value never swallows the next line.
+_FIELD_RE = re.compile(r"(?m)^[ \t]*([^:\n]+?)[ \t]*:[ \t]*(.*?)[ \t\r]*$")
+
+
 def try_run(cmd: list[str], timeout: int = 3) -> tuple[int, str, str]:
     """Run subprocess safely, return (rc, stdout, stderr)."""
     try:
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        out, err = proc.communicate(timeout=timeout)
-        return proc.returncode, out or "", err or ""
+        # Bytes in, decoded once: upsc/apcaccess only ever print ASCII
+        cp = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, timeout=timeout)
+        return cp.returncode, cp.stdout.decode("ascii", "replace"), cp.stderr.decode("ascii", "replace")
+    except subprocess.TimeoutExpired:
+        # run() has already killed and reaped the child
+        return -1, "", f"timed out after {timeout}s"
     except Exception as e:
         return -1, "", str(e)
 
 
-def probe_nut_upsc(cfg: AppConfig) -> Optional[UPSStatus]:
-    """Probe UPS via NUT 'upsc <upsname>'."""
-    rc, out, err = try_run([cfg.nut_upsc_cmd, cfg.nut_ups_name], timeout=3)
-    if rc != 0 or not out.strip():
-        return None
+# upsd reply lines like: VAR ups battery.charge "97"
+_NUT_VAR_RE = re.compile(r'^VAR \S+ (\S+) "((?:[^"\\]|\\.)*)"$')
+_NUT_UNESCAPE_RE = re.compile(r"\\(.)")
 
-    fields = {}
-    for line in out.splitlines():
-        # Lines like: "battery.charge: 97"
-        if ":" in line:
-            k, v = line.split(":", 1)
-            fields[k.strip()] = v.strip()
 
-    status = UPSStatus(source="nut", raw=fields, timestamp=time.time())
-    # Map common fields
-    charge = fields.get("battery.charge")
-    if charge:
-        try:
-            status.percentage = float(charge)
-        except:
-            pass
+class _NutClient:
+    """Persistent connection to upsd's line protocol, replacing a upsc spawn per poll."""
+
+    def __init__(self, host: str, port: int, timeout: float = 3):
+        self.addr = (host, port)
+        self.sock = socket.create_connection(self.addr, timeout=timeout)
+        self.f = self.sock.makefile("rwb")
 
-    runtime = fields.get("battery.runtime")
-    if runtime:
+    def list_vars(self, ups: str) -> dict[str, str]:
+        self.f.write(b"LIST VAR %s\n" % ups.encode("ascii"))
+        self.f.flush()
+        pairs = []
+        while True:
+            line = self.f.readline()
+            if not line:
+                raise ConnectionError("upsd closed the connection")
+            line = line.decode("ascii", "replace").rstrip("\r\n")
+            if line.startswith("END LIST VAR"):
+                # Built in one go so the dict is sized once
+                return dict(pairs)
+            if line.startswith("ERR"):
+                raise RuntimeError(f"upsd: {line}")
+            m = _NUT_VAR_RE.match(line)
+            if m:
+                pairs.append((m.group(1), _NUT_UNESCAPE_RE.sub(r"\1", m.group(2))))
+
+    def close(self):
         try:
-            status.runtime_seconds = int(float(runtime))
-        except:
+            self.f.close()
+            self.sock.close()
+        except OSError:
             pass
 
+
+_NUT_CLIENT: Optional[_NutClient] = None
+
+
+def _nut_target(name: str) -> tuple[str, str, int]:
+    """Split 'ups[@host[:port]]' into (ups, host, port)."""
+    ups, _, hostport = name.partition("@")
+    host, _, port = (hostport or "localhost").partition(":")
+    return ups, host, int(port) if port else 3493
+
+
+def _nut_fields_tcp(cfg: AppConfig) -> Optional[dict[str, str]]:
+    """Ask upsd directly; None if it can't be reached so the caller falls back to upsc."""
+    global _NUT_CLIENT
+    try:
+        ups, host, port = _nut_target(cfg.nut_ups_name)
+        if _NUT_CLIENT is None or _NUT_CLIENT.addr != (host, port):
+            if _NUT_CLIENT is not None:
+                _NUT_CLIENT.close()
+            _NUT_CLIENT = _NutClient(host, port)
+        return _NUT_CLIENT.list_vars(ups) or None
+    except (OSError, ValueError, RuntimeError):
+        # Broken pipe, refused, or an upsd error; reconnect on the next poll
+        if _NUT_CLIENT is not None:
+            _NUT_CLIENT.close()
+            _NUT_CLIENT = None
+        return None
+
+
+# (field, UPSStatus attribute, cast, multiplier). Values may carry a unit suffix,
+# so only the first token is converted.
+_NUT_MAP = (
+    ("battery.charge", "percentage", float, 1.0),
+    ("battery.runtime", "runtime_seconds", int, 1.0),
+    ("input.voltage", "voltage_in", float, 1.0),
+    ("output.voltage", "voltage_out", float, 1.0),
+    ("ups.load", "load_pct", float, 1.0),
+)
+_APC_MAP = (
+    ("bcharge", "percentage", float, 1.0),       # BCHARGE  : 97.0 Percent
+    ("timeleft", "runtime_seconds", int, 60.0),  # TIMELEFT : 52.1 Minutes
+    ("linev", "voltage_in", float, 1.0),
+    ("outputv", "voltage_out", float, 1.0),
+    ("loadpct", "load_pct", float, 1.0),         # LOADPCT  : 12.0 Percent
+)
+
+
+def _apply_numeric(status: UPSStatus, fields: dict[str, str], mapping) -> None:
+    for key, attr, cast, mul in mapping:
+        v = fields.get(key)
+        if v:
+            try:
+                setattr(status, attr, cast(float(v.split()[0]) * mul))
+            except ValueError:
+                pass
+
+
+def probe_nut_upsc(cfg: AppConfig, use_upsc: bool = True) -> Optional[UPSStatus]:
+    """Probe UPS via NUT: upsd's TCP protocol, falling back to 'upsc <upsname>'."""
+    fields = _nut_fields_tcp(cfg)
+    if fields is None:
+        if not use_upsc:
+            return None
+        rc, out, err = try_run([cfg.nut_upsc_cmd, cfg.nut_ups_name], timeout=3)
+        if rc != 0 or not out.strip():
+            return None
+
+        # Lines like: "battery.charge: 97"
+        fields = dict(_FIELD_RE.findall(out))
+
+    status = UPSStatus(source="nut", raw=fields if cfg.keep_raw else None, timestamp=time.time())
+    # Map common fields
+    _apply_numeric(status, fields, _NUT_MAP)
+
     # status.status may be like "OL" (On line), "OB" (On battery)
-    st = fields.get("ups.status", fields.get("status"))
+    st = next((v for v in map(fields.get, ("ups.status", "status")) if v), None)
     if st:
         status.status_text = st
         if "OB" in st or "DISCHRG" in st:
@@ -141,16 +251,6 @@ def probe_nut_upsc(cfg: AppConfig) -> Optional[UPSStatus]:
         elif "OL" in st or "CHRG" in st:
             status.on_battery = False
 
-    vin = fields.get("input.voltage")
-    vout = fields.get("output.voltage")
-    load = fields.get("ups.load")
-    for val, attr in [(vin, "voltage_in"), (vout, "voltage_out"), (load, "load_pct")]:
-        if val:
-            try:
-                setattr(status, attr, float(val))
-            except:
-                pass
-
     return status
 
 
@@ -160,52 +260,11 @@ def probe_apcaccess(cfg: AppConfig) -> Optional[UPSStatus]:
     if rc != 0 or not out.strip():
         return None
 
-    fields = {}
-    for line in out.splitlines():
-        # Lines like: "STATUS   : ONLINE"
-        if ":" in line:
-            k, v = line.split(":", 1)
-            fields[k.strip().lower()] = v.strip()
-
-    status = UPSStatus(source="apcupsd", raw=fields, timestamp=time.time())
-    # Battery remaining (BCHARGE : 97.0 Percent)
-    bchg = fields.get("bcharge")
-    if bchg:
-        try:
-            status.percentage = float(bchg.split()[0])
-        except:
-            pass
-
-    # TIMELEFT : 52.1 Minutes
-    tleft = fields.get("timeleft")
-    if tleft:
-        try:
-            minutes = float(tleft.split()[0])
-            status.runtime_seconds = int(minutes * 60)
-        except:
-            pass
+    # Lines like: "STATUS   : ONLINE"
+    fields = {k.lower(): v for k, v in _FIELD_RE.findall(out)}
 
-    # LINEV / OUTPUTV
-    linev = fields.get("linev")
-    outv = fields.get("outputv")
-    if linev:
-        try:
-            status.voltage_in = float(linev.split()[0])
-        except:
-            pass
-    if outv:
-        try:
-            status.voltage_out = float(outv.split()[0])
-        except:
-            pass
-
-    # LOADPCT : 12.0 Percent
-    loadpct = fields.get("loadpct")
-    if loadpct:
-        try:
-            status.load_pct = float(loadpct.split()[0])
-        except:
-            pass
+    status = UPSStatus(source="apcupsd", raw=fields if cfg.keep_raw else None, timestamp=time.time())
+    _apply_numeric(status, fields, _APC_MAP)
 
     # STATUS : ONLINE | ONBATT | CHARGING
     st = fields.get("status")
@@ -219,17 +278,28 @@ def probe_apcaccess(cfg: AppConfig) -> Optional[UPSStatus]:
     return status
 
 
+_WMI_SVC = None
+
+
 def probe_windows_wmi_fallback() -> Optional[UPSStatus]:
     """Fallback using Windows WMI Battery for laptops or HID UPS with battery class."""
+    global _WMI_SVC
     if os.name != "nt" or win32com is None:
         return None
 
     try:
-        wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-        svc = wmi.ConnectServer(".", "root\\CIMV2")
-        # Win32_Battery may represent UPS battery when drivers expose it as a battery
-        batteries = svc.ExecQuery("SELECT * FROM Win32_Battery")
-        status = UPSStatus(source="wmi", raw={}, timestamp=time.time())
+        # Connecting is a COM activation round trip; do it once and reuse the service
+        if _WMI_SVC is None:
+            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
+            _WMI_SVC = wmi.ConnectServer(".", "root\\CIMV2")
+        try:
+            # Win32_Battery may represent UPS battery when drivers expose it as a battery
+            batteries = _WMI_SVC.ExecQuery("SELECT * FROM Win32_Battery")
+        except Exception:
+            # Stale connection; reconnect on the next poll
+            _WMI_SVC = None
+            return None
+        status = UPSStatus(source="wmi", timestamp=time.time())
         if batteries.Count == 0:
             return None
 
@@ -264,17 +334,60 @@ def probe_windows_wmi_fallback() -> Optional[UPSStatus]:
         return None
 
 
+# ------------------------------
+# Alert evaluation
+# ------------------------------
+
+_CRITICAL = ("Critical: prepare to shut down", "#b00000")
+_LOW = ("Low battery: reduce load and save work", "#b06a00")
+_ON_BATTERY = ("On battery: monitor usage and runtime", "#004a8f")
+_CHARGING = ("Charging: stable power", "#007a3d")
+_FULL = ("Online: battery full", "#007a3d")
+_UNKNOWN = ("Unknown power state", "#444444")
+
+# (text, color) indexed by [power state][charge band]; states are on battery,
+# online, unknown and bands come from _charge_band.
+_ALERT_TABLE = (
+    (_CRITICAL, _LOW, _ON_BATTERY, _ON_BATTERY),
+    (_CHARGING, _CHARGING, _CHARGING, _FULL),
+    (_UNKNOWN, _UNKNOWN, _UNKNOWN, _UNKNOWN),
+)
+
+
+def _charge_band(pct: float, low: int, crit: int) -> int:
+    """0 at/below critical, 1 at/below low, 2 below full, 3 full."""
+    if pct <= crit:
+        return 0
+    if pct <= low:
+        return 1
+    if pct < 100:
+        return 2
+    return 3
+
+
+if njit is not None:
+    _charge_band = njit(cache=True)(_charge_band)
+
+
 # ------------------------------
 # LLM Insights
 # ------------------------------
 
+def _dumps_bytes(obj) -> bytes:
+    """Compact UTF-8 JSON, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def build_llm_prompt(ups: UPSStatus, cfg: AppConfig) -> str:
     """Create a concise prompt for the LLM to summarize risk and actions."""
-    # Keep it compact and actionable
+    # Keep it compact and actionable. Charge is rounded to 1% and the time to the
+    # minute so near-identical statuses give the same prompt (and LLM cache key).
     data = {
         "source": ups.source,
         "on_battery": ups.on_battery,
-        "percentage": ups.percentage,
+        "percentage": round(ups.percentage) if ups.percentage is not None else None,
         "runtime_seconds": ups.runtime_seconds,
         "voltage_in": ups.voltage_in,
         "voltage_out": ups.voltage_out,
@@ -282,12 +395,12 @@ def build_llm_prompt(ups: UPSStatus, cfg: AppConfig) -> str:
         "status_text": ups.status_text,
         "low_threshold": cfg.low_battery_threshold_pct,
         "critical_threshold": cfg.critical_battery_threshold_pct,
-        "timestamp": datetime.fromtimestamp(ups.timestamp).isoformat(),
+        "timestamp": datetime.fromtimestamp(ups.timestamp).isoformat(timespec="minutes"),
     }
     return (
         "Analyze UPS status JSON and provide a brief, practical summary with risk level "
         "(Low/Moderate/High/Critical), and 2–3 recommended actions:\n\n"
-        f"{json.dumps(data, ensure_ascii=False)}\n\n"
+        f"{_dumps_bytes(data).decode('utf-8')}\n\n"
         "Output format:\n"
         "- Risk: <level>\n"
         "- Why: <one sentence>\n"
@@ -295,6 +408,23 @@ def build_llm_prompt(ups: UPSStatus, cfg: AppConfig) -> str:
     )
 
 
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _llm_session():
+    """Shared keep-alive session so repeated summaries skip the TCP/TLS handshake."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            from requests.adapters import HTTPAdapter
+            _SESSION = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+            _SESSION.mount("http://", adapter)
+            _SESSION.mount("https://", adapter)
+        return _SESSION
+
+
 def call_llm(prompt: str, cfg: AppConfig) -> str:
     """Call an external LLM endpoint in a generic way. Returns text or an empty string."""
     if not cfg.llm_enabled or not cfg.llm_endpoint or requests is None:
@@ -311,13 +441,14 @@ def call_llm(prompt: str, cfg: AppConfig) -> str:
             "temperature": 0.2,
             "max_tokens": 256,
         }
-        headers = {"Content-Type": "application/json"}
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
         if cfg.llm_api_key:
             headers["Authorization"] = f"Bearer {cfg.llm_api_key}"
 
-        resp = requests.post(cfg.llm_endpoint, headers=headers, json=payload, timeout=cfg.llm_timeout_sec)
+        resp = _llm_session().post(cfg.llm_endpoint, headers=headers, data=_dumps_bytes(payload),
+                                   timeout=cfg.llm_timeout_sec)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
         # Try standard chat completion shape; fallback to text
         content = ""
         if isinstance(data, dict):
@@ -335,30 +466,59 @@ def call_llm(prompt: str, cfg: AppConfig) -> str:
 # Poller
 # ------------------------------
 
-class UPSMonitor(threading.Thread):
-    def __init__(self, cfg: AppConfig, updates: queue.Queue):
-        super().__init__(daemon=True)
-        self.cfg = cfg
-        self.updates = updates
-        self._stop = threading.Event()
-
-    def stop(self):
-        self._stop.set()
+class UPSMonitor:
+    """Runs the probes; UPSApp calls poll_once on its worker and schedules the next poll."""
+    # Consecutive failures of the remembered probe before rediscovering
+    PROBE_FAIL_LIMIT = 3
+    # How often to look for upsc/apcaccess again, in case they get installed
+    TOOL_RECHECK_SEC = 300
 
-    def run(self):
-        while not self._stop.is_set():
-            status = self.poll_once()
-            if status:
-                self.updates.put(status)
-            time.sleep(self.cfg.poll_interval_sec)
+    def __init__(self, cfg: AppConfig):
+        self.cfg = cfg
+        self._tools_checked = 0.0
+        self._have_upsc = self._have_apc = False
+        # Priority: NUT -> APCUPSD -> WMI. Missing binaries are skipped instead of
+        # paying for a failed exec every poll.
+        self._probes = (
+            lambda: probe_nut_upsc(self.cfg, use_upsc=self._have_upsc),
+            lambda: probe_apcaccess(self.cfg) if self._have_apc else None,
+            probe_windows_wmi_fallback,
+        )
+        self._active_probe: Optional[Callable[[], Optional[UPSStatus]]] = None
+        self._fail_streak = 0
+
+    def _check_tools(self):
+        now = time.monotonic()
+        if self._tools_checked and now - self._tools_checked < self.TOOL_RECHECK_SEC:
+            return
+        self._tools_checked = now
+        self._have_upsc = shutil.which(self.cfg.nut_upsc_cmd) is not None
+        self._have_apc = shutil.which(self.cfg.apcaccess_cmd) is not None
+
+    def _probe(self) -> Optional[UPSStatus]:
+        self._check_tools()
+        # Stick with the backend that answered last time instead of spawning every
+        # prober each poll; fall back to the full cascade after repeated failures.
+        if self._active_probe is not None:
+            st = self._active_probe()
+            if st is not None:
+                self._fail_streak = 0
+                return st
+            self._fail_streak += 1
+            if self._fail_streak < self.PROBE_FAIL_LIMIT:
+                return None
+            self._active_probe = None
+            self._fail_streak = 0
+
+        for probe in self._probes:
+            st = probe()
+            if st is not None:
+                self._active_probe = probe
+                return st
+        return None
 
     def poll_once(self) -> Optional[UPSStatus]:
-        # Priority: NUT -> APCUPSD -> WMI -> None
-        st = probe_nut_upsc(self.cfg)
-        if st is None:
-            st = probe_apcaccess(self.cfg)
-        if st is None:
-            st = probe_windows_wmi_fallback()
+        st = self._probe()
 
         # Enrich status text if empty
         if st is not None and not st.status_text:
@@ -377,6 +537,8 @@ class UPSMonitor(threading.Thread):
 # ------------------------------
 
 class UPSApp(tk.Tk):
+    LLM_CACHE_SIZE = 8
+
     def __init__(self, cfg: AppConfig):
         super().__init__()
         self.title("UPS Power Manager")
@@ -384,16 +546,22 @@ class UPSApp(tk.Tk):
         self.minsize(800, 520)
 
         self.cfg = cfg
-        self.updates = queue.Queue()
-        self.monitor = UPSMonitor(cfg, self.updates)
-        self.log_lines: list[str] = []
+        self.monitor = UPSMonitor(cfg)
+        # Probes block on subprocesses, so they run on one worker; polls are
+        # chained with after() instead of a sleeping thread and a polled queue.
+        self._exec = ThreadPoolExecutor(max_workers=1)
+        self._closing = False
+        self.log_lines: deque[str] = deque(maxlen=cfg.log_capacity)
         self.last_status: Optional[UPSStatus] = None
+        self._last_ts_sec = 0
+        self._last_ts_str = ""
+        self._log_line_count = 0
+        self._llm_cache: OrderedDict[bytes, str] = OrderedDict()
 
         self._build_ui()
         self._bind_events()
 
-        self.monitor.start()
-        self.after(200, self._drain_updates)
+        self._schedule_poll()
 
     def _build_ui(self):
         # Top frame: Status
@@ -404,21 +572,23 @@ class UPSApp(tk.Tk):
         grid.pack(fill="x", padx=8, pady=8)
 
         # Labels
-        self.lbl_source = self._labeled_value(grid, "Source", 0)
-        self.lbl_on_battery = self._labeled_value(grid, "On battery", 1)
-        self.lbl_percentage = self._labeled_value(grid, "Charge (%)", 2)
-        self.lbl_runtime = self._labeled_value(grid, "Runtime (s)", 3)
-        self.lbl_vin = self._labeled_value(grid, "Input V", 4)
-        self.lbl_vout = self._labeled_value(grid, "Output V", 5)
-        self.lbl_load = self._labeled_value(grid, "Load (%)", 6)
-        self.lbl_status = self._labeled_value(grid, "Status text", 7)
+        self.var_source = self._labeled_value(grid, "Source", 0)
+        self.var_on_battery = self._labeled_value(grid, "On battery", 1)
+        self.var_percentage = self._labeled_value(grid, "Charge (%)", 2)
+        self.var_runtime = self._labeled_value(grid, "Runtime (s)", 3)
+        self.var_vin = self._labeled_value(grid, "Input V", 4)
+        self.var_vout = self._labeled_value(grid, "Output V", 5)
+        self.var_load = self._labeled_value(grid, "Load (%)", 6)
+        self.var_status = self._labeled_value(grid, "Status text", 7)
 
         # Progress and alert banner
         prog_frame = ttk.Frame(top)
         prog_frame.pack(fill="x", padx=8, pady=4)
         self.progress = ttk.Progressbar(prog_frame, orient="horizontal", mode="determinate", length=300)
         self.progress.pack(side="left", padx=(0, 8))
-        self.alert_label = ttk.Label(prog_frame, text="No alert", foreground="#222")
+        self.alert_var = tk.StringVar(value="No alert")
+        self._alert_fg = "#222"
+        self.alert_label = ttk.Label(prog_frame, textvariable=self.alert_var, foreground=self._alert_fg)
         self.alert_label.pack(side="left", padx=8)
 
         # Middle: Controls
@@ -505,20 +675,24 @@ class UPSApp(tk.Tk):
         self.llm_text.pack(fill="both", expand=True, padx=8, pady=8)
         self.llm_text.insert("1.0", "LLM disabled.\n")
 
-    def _labeled_value(self, parent: ttk.Frame, label: str, row: int) -> ttk.Label:
+    def _labeled_value(self, parent: ttk.Frame, label: str, row: int) -> tk.StringVar:
         ttk.Label(parent, text=label + ":").grid(row=row, column=0, sticky="w", padx=2, pady=2)
-        val = ttk.Label(parent, text="-")
-        val.grid(row=row, column=1, sticky="w", padx=6, pady=2)
-        return val
+        var = tk.StringVar(value="-")
+        ttk.Label(parent, textvariable=var).grid(row=row, column=1, sticky="w", padx=6, pady=2)
+        return var
+
+    @staticmethod
+    def _set_var(var: tk.StringVar, value: str):
+        # Most polls repeat the previous values; skip the Tcl round trip and redraw
+        if var.get() != value:
+            var.set(value)
 
     def _bind_events(self):
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _on_close(self):
-        try:
-            self.monitor.stop()
-        except Exception:
-            pass
+        self._closing = True
+        self._exec.shutdown(wait=False, cancel_futures=True)
         self.destroy()
 
     def _toggle_shutdown(self):
@@ -533,9 +707,7 @@ class UPSApp(tk.Tk):
         self._log(f"LLM {'enabled' if self.cfg.llm_enabled else 'disabled'}.")
 
     def _refresh_now(self):
-        st = self.monitor.poll_once()
-        if st:
-            self._apply_status(st)
+        self._submit_poll(reschedule=False)
 
     def _save_log(self):
         path = filedialog.asksaveasfilename(defaultextension=".log", filetypes=[("Log files", "*.log"), ("All files", "*.*")])
@@ -563,7 +735,23 @@ class UPSApp(tk.Tk):
             except Exception as e:
                 self._log(f"Process scan failed: {e}")
 
-    def _drain_updates(self):
+    def _schedule_poll(self):
+        self._submit_poll(reschedule=True)
+
+    def _submit_poll(self, reschedule: bool):
+        if self._closing:
+            return
+        fut = self._exec.submit(self.monitor.poll_once)
+        fut.add_done_callback(lambda f: self._post_poll(f, reschedule))
+
+    def _post_poll(self, fut, reschedule: bool):
+        # Runs on the worker thread; hand the result to the Tk thread
+        if not self._closing:
+            self.after(0, lambda: self._on_poll_done(fut, reschedule))
+
+    def _on_poll_done(self, fut, reschedule: bool):
+        if self._closing:
+            return
         # Update config from entries
         try:
             self.cfg.poll_interval_sec = int(self.poll_var.get())
@@ -572,64 +760,69 @@ class UPSApp(tk.Tk):
         except Exception:
             pass
 
-        drained = False
-        while True:
-            try:
-                st = self.updates.get_nowait()
-                self._apply_status(st)
-                drained = True
-            except queue.Empty:
-                break
+        try:
+            st = fut.result()
+        except Exception as e:
+            st = None
+            self._log(f"Poll failed: {e}")
+        if st:
+            self._apply_status(st)
 
-        # If nothing drained, re-check soon; otherwise, immediate next tick
-        self.after(200 if drained else 500, self._drain_updates)
+        if reschedule:
+            self.after(max(1, self.cfg.poll_interval_sec) * 1000, self._schedule_poll)
 
     def _apply_status(self, st: UPSStatus):
         self.last_status = st
         # Update labels
-        self.lbl_source.config(text=st.source)
-        self.lbl_on_battery.config(text=str(st.on_battery) if st.on_battery is not None else "-")
-        self.lbl_percentage.config(text=f"{st.percentage:.1f}" if st.percentage is not None else "-")
-        self.lbl_runtime.config(text=str(st.runtime_seconds) if st.runtime_seconds is not None else "-")
-        self.lbl_vin.config(text=f"{st.voltage_in:.1f}" if st.voltage_in is not None else "-")
-        self.lbl_vout.config(text=f"{st.voltage_out:.1f}" if st.voltage_out is not None else "-")
-        self.lbl_load.config(text=f"{st.load_pct:.1f}" if st.load_pct is not None else "-")
-        self.lbl_status.config(text=st.status_text or "-")
+        self._set_var(self.var_source, st.source)
+        self._set_var(self.var_on_battery, str(st.on_battery) if st.on_battery is not None else "-")
+        self._set_var(self.var_percentage, f"{st.percentage:.1f}" if st.percentage is not None else "-")
+        self._set_var(self.var_runtime, str(st.runtime_seconds) if st.runtime_seconds is not None else "-")
+        self._set_var(self.var_vin, f"{st.voltage_in:.1f}" if st.voltage_in is not None else "-")
+        self._set_var(self.var_vout, f"{st.voltage_out:.1f}" if st.voltage_out is not None else "-")
+        self._set_var(self.var_load, f"{st.load_pct:.1f}" if st.load_pct is not None else "-")
+        self._set_var(self.var_status, st.status_text or "-")
 
         # Progress + alerts
         pct = st.percentage if st.percentage is not None else 0.0
-        self.progress["value"] = max(0, min(100, pct))
+        # Straight Tcl call; skips the ttk wrapper's option handling
+        self.tk.call(self.progress._w, "configure", "-value", max(0, min(100, pct)))
 
         alert_txt, alert_fg = self._compute_alert(pct, st.on_battery)
-        self.alert_label.config(text=alert_txt, foreground=alert_fg)
+        self._set_var(self.alert_var, alert_txt)
+        if alert_fg != self._alert_fg:
+            self._alert_fg = alert_fg
+            self.alert_label.config(foreground=alert_fg)
 
         # Log line
-        ts = datetime.fromtimestamp(st.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(st.timestamp))
         self._log(f"[{ts}] {st.source} | batt={st.on_battery} | {pct:.1f}% | rt={st.runtime_seconds}s | load={st.load_pct}% | {st.status_text}")
 
+        # Redraw everything changed above in one pass
+        self.update_idletasks()
+
     def _compute_alert(self, pct: float, on_battery: Optional[bool]) -> tuple[str, str]:
-        if on_battery is True:
-            if pct <= self.cfg.critical_battery_threshold_pct:
-                return ("Critical: prepare to shut down", "#b00000")
-            if pct <= self.cfg.low_battery_threshold_pct:
-                return ("Low battery: reduce load and save work", "#b06a00")
-            return ("On battery: monitor usage and runtime", "#004a8f")
-        elif on_battery is False:
-            if pct < 100:
-                return ("Charging: stable power", "#007a3d")
-            return ("Online: battery full", "#007a3d")
-        else:
-            return ("Unknown power state", "#444444")
+        state = 0 if on_battery is True else 1 if on_battery is False else 2
+        band = _charge_band(float(pct), self.cfg.low_battery_threshold_pct, self.cfg.critical_battery_threshold_pct)
+        return _ALERT_TABLE[state][band]
 
     def _log(self, line: str):
-        ts = datetime.now().strftime("%H:%M:%S")
-        full = f"{ts} | {line}"
+        # Several lines are logged per second; format the clock once per second
+        sec = int(time.time())
+        if sec != self._last_ts_sec:
+            self._last_ts_sec = sec
+            self._last_ts_str = time.strftime("%H:%M:%S", time.localtime(sec))
+        full = f"{self._last_ts_str} | {line}"
         self.log_lines.append(full)
-        if len(self.log_lines) > self.cfg.log_capacity:
-            self.log_lines = self.log_lines[-self.cfg.log_capacity:]
 
         self.log_text.configure(state="normal")
         self.log_text.insert("end", full + "\n")
+        # Keep the widget at log_capacity lines so inserts stay cheap in long sessions
+        self._log_line_count += full.count("\n") + 1
+        excess = self._log_line_count - self.cfg.log_capacity
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self._log_line_count = self.cfg.log_capacity
         self.log_text.see("end")
         self.log_text.configure(state="disabled")
 
@@ -643,13 +836,30 @@ class UPSApp(tk.Tk):
             return
 
         prompt = build_llm_prompt(self.last_status, self.cfg)
+        key = hashlib.blake2b(
+            "\0".join((self.cfg.llm_endpoint, self.cfg.llm_model, prompt)).encode("utf-8"),
+            digest_size=16).digest()
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            # Same status as a recent summary; skip the network round trip
+            self._llm_cache.move_to_end(key)
+            self._llm_set_text(cached)
+            return
 
         def work():
             summary = call_llm(prompt, self.cfg)
-            self.after(0, lambda: self._llm_set_text(summary or "No response."))
+            self.after(0, lambda: self._llm_done(key, summary))
 
         threading.Thread(target=work, daemon=True).start()
 
+    def _llm_done(self, key: bytes, summary: str):
+        # Errors and empty replies are not cached, so the next click retries
+        if summary and not summary.startswith("LLM error:"):
+            self._llm_cache[key] = summary
+            if len(self._llm_cache) > self.LLM_CACHE_SIZE:
+                self._llm_cache.popitem(last=False)
+        self._llm_set_text(summary or "No response.")
+
     def _llm_set_text(self, text: str):
         self.llm_text.delete("1.0", "end")
         self.llm_text.insert("1.0", text or "")
@@ -1,18 +1,39 @@
 # mpc_ai_controller.py
 import os
+import re
 import time
 import json
+import atexit
 import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+# Optional: faster JSON for LLM output and HTTP bodies
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 # LLM (OpenAI SDK)
 from openai import OpenAI
 
+# Optional: semantic intent cache
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Windows UI fallback
-from pywinauto import Application, keyboard
+from pywinauto import Application, handleprops, keyboard
 from pywinauto.findwindows import find_window
 
 
@@ -24,6 +45,15 @@ MPC_PORT = int(os.environ.get("MPC_PORT", "13579"))
 MPC_BASE = f"http://{MPC_HOST}:{MPC_PORT}"
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+# One client for the process so its connection pool is reused across prompts
+OPENAI_CLIENT = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+
+# Keep-alive pool for the MPC-HC web interface; volume/seek loops reuse one connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+# How long a web-interface availability probe stays valid
+WEB_CHECK_TTL_SEC = 5.0
 
 # Web command mapping for MPC-HC
 # Reference: MPC-HC exposes wm_command via /command.html?wm_command={id}
@@ -43,6 +73,12 @@ WM_COMMANDS = {
     "rate_dec": 898,      # Decrease playback rate
     "normal_rate": 899,   # Reset rate to normal
 }
+# wm_command=-2 with a volume=N parameter sets an absolute volume (0..100)
+WM_SET_VOLUME = -2
+# Matches MPC-HC's default volume step, so N steps here equal N presses there
+VOLUME_STEP = 5
+
+_VOLUME_RE = re.compile(r'id="volumelevel">\s*(\d+)')
 
 # -----------------------------
 # LLM Intent Parsing
@@ -64,95 +100,316 @@ Examples:
 "normal speed" -> {"action":"normal_rate","notes":"reset rate"}
 """
 
+# Override to route intent parsing to a cheaper/smaller model
+INTENT_MODEL = os.environ.get("INTENT_MODEL", "gpt-4o-mini")
+
+# An intent is a few dozen tokens; the cap stops runaway generations
+INTENT_MAX_TOKENS = 128
+
+ACTIONS = (
+    "play_pause", "stop", "next", "prev", "seek_forward", "seek_backward", "volume_up",
+    "volume_down", "mute", "fullscreen", "audio_cycle", "sub_cycle", "rate_inc", "rate_dec",
+    "normal_rate",
+)
+# Structured output: the model can only emit a known action, no free-form text
+_INTENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action": {"type": "string", "enum": list(ACTIONS)},
+        "value": {"type": ["number", "null"]},
+        "notes": {"type": "string"},
+    },
+    "required": ["action", "value", "notes"],
+    "additionalProperties": False,
+}
+_INTENT_FORMAT = {"format": {"type": "json_schema", "name": "intent", "schema": _INTENT_SCHEMA, "strict": True}}
+_INTENTS_FORMAT = {"format": {"type": "json_schema", "name": "intents", "strict": True, "schema": {
+    "type": "object",
+    "properties": {"intents": {"type": "array", "items": _INTENT_SCHEMA}},
+    "required": ["intents"],
+    "additionalProperties": False,
+}}}
+
+BATCH_PROMPT_SUFFIX = """
+Batch mode: the user message is a JSON array of commands. Return one JSON object
+{"intents": [...]} holding exactly one intent object per command, in the same order.
+"""
+
+# Users repeat the same few phrases, so LLM intents are cached by normalized text
+# (LRU + TTL) and persisted across restarts.
+INTENT_CACHE_SIZE = 1024
+INTENT_CACHE_TTL_SEC = 3600
+INTENT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mpc_ai", "intents.json")
+
+_intent_cache: "OrderedDict[str, tuple[Dict[str, Any], float]]" = OrderedDict()
+_intent_lock = threading.Lock()
+
+
+def _load_intent_cache():
+    try:
+        with open(INTENT_CACHE_PATH, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return
+    cutoff = time.time() - INTENT_CACHE_TTL_SEC
+    try:
+        for key, (intent, ts) in entries.items():
+            if ts >= cutoff:
+                _intent_cache[key] = (intent, ts)
+    except (AttributeError, TypeError, ValueError):
+        # Not in the format we write; start cold
+        _intent_cache.clear()
+
+
+def _save_intent_cache():
+    try:
+        os.makedirs(os.path.dirname(INTENT_CACHE_PATH), exist_ok=True)
+        with _intent_lock:
+            entries = dict(_intent_cache)
+        with open(INTENT_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+    except OSError:
+        pass
+
+
+_load_intent_cache()
+atexit.register(_save_intent_cache)
+
+
+def _intent_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _cached_intent(key: str) -> Optional[Dict[str, Any]]:
+    with _intent_lock:
+        hit = _intent_cache.get(key)
+        if hit is not None and time.time() - hit[1] < INTENT_CACHE_TTL_SEC:
+            _intent_cache.move_to_end(key)
+            return hit[0]
+    return None
+
+
+def _cache_intent(key: str, intent: Dict[str, Any]):
+    with _intent_lock:
+        _intent_cache[key] = (intent, time.time())
+        _intent_cache.move_to_end(key)
+        if len(_intent_cache) > INTENT_CACHE_SIZE:
+            _intent_cache.popitem(last=False)
+
+
+# Paraphrases ("pause the video" / "please pause") miss the exact cache, so
+# misses are also matched by embedding similarity against earlier LLM intents.
+EMBED_MODEL = "text-embedding-3-small"
+SEMANTIC_MIN_SIMILARITY = 0.92
+
+_sem_vecs = None                          # (n, d) unit vectors, oldest first
+_sem_intents: list[Dict[str, Any]] = []
+_sem_numbers: list[tuple] = []            # numbers in each entry's original text
+
+# "forward 20 seconds" embeds close to "forward 45 seconds"; a semantic hit is
+# only reused when the numbers in both commands match
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _embed(text: str):
+    if np is None:
+        return None
+    try:
+        res = OPENAI_CLIENT.embeddings.create(model=EMBED_MODEL, input=text)
+    except Exception:
+        return None
+    vec = np.asarray(res.data[0].embedding, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def _semantic_intent(vec, numbers: tuple) -> Optional[Dict[str, Any]]:
+    with _intent_lock:
+        if _sem_vecs is None:
+            return None
+        sims = _sem_vecs @ vec
+        for i in np.argsort(sims)[::-1]:
+            if sims[i] < SEMANTIC_MIN_SIMILARITY:
+                break
+            if _sem_numbers[i] == numbers:
+                return _sem_intents[i]
+        return None
+
+
+def _cache_semantic(vec, numbers: tuple, intent: Dict[str, Any]):
+    global _sem_vecs
+    with _intent_lock:
+        _sem_vecs = vec[None, :] if _sem_vecs is None else np.vstack((_sem_vecs, vec))
+        _sem_intents.append(intent)
+        _sem_numbers.append(numbers)
+        if len(_sem_intents) > INTENT_CACHE_SIZE:
+            _sem_vecs = _sem_vecs[1:]
+            del _sem_intents[0]
+            del _sem_numbers[0]
+
+
 def parse_intent_with_llm(text: str) -> Dict[str, Any]:
-    if not OPENAI_API_KEY:
+    if OPENAI_CLIENT is None:
         # Minimal rule-based fallback if no API key present
         return simple_rule_intent(text)
 
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    res = client.responses.create(
-        model="gpt-4o-mini",
+    # Commands with a clear keyword never need the LLM
+    intent = rule_intent(text)
+    if intent is not None:
+        return intent
+
+    key = _intent_key(text)
+    intent = _cached_intent(key)
+    if intent is not None:
+        return intent
+
+    # Only text the keyword rules couldn't parse gets here, so the embedding
+    # round trip is spent on commands that would otherwise go to the LLM
+    numbers = tuple(_NUMBER_RE.findall(text))
+    vec = _embed(text)
+    if vec is not None:
+        intent = _semantic_intent(vec, numbers)
+        if intent is not None:
+            _cache_intent(key, intent)
+            return intent
+
+    intent = _llm_intent(text)
+    if intent is None:
+        # If parsing fails, try rule-based (not cached, so the LLM gets another go)
+        return simple_rule_intent(text)
+    _cache_intent(key, intent)
+    if vec is not None:
+        _cache_semantic(vec, numbers, intent)
+    return intent
+
+
+def parse_intents_with_llm(texts: list[str]) -> list[Dict[str, Any]]:
+    """Like parse_intent_with_llm for several commands, with one LLM call for all cache misses."""
+    if OPENAI_CLIENT is None:
+        return [simple_rule_intent(t) for t in texts]
+
+    keys = [_intent_key(t) for t in texts]
+    intents: list[Optional[Dict[str, Any]]] = [rule_intent(t) or _cached_intent(k) for t, k in zip(texts, keys)]
+    misses = [i for i, intent in enumerate(intents) if intent is None]
+    if len(misses) == 1:
+        intents[misses[0]] = parse_intent_with_llm(texts[misses[0]])
+    elif misses:
+        parsed = _llm_intents([texts[i] for i in misses])
+        for i, intent in zip(misses, parsed):
+            if intent is None:
+                intents[i] = simple_rule_intent(texts[i])
+            else:
+                _cache_intent(keys[i], intent)
+                intents[i] = intent
+    return intents
+
+
+def _llm_intent(text: str) -> Optional[Dict[str, Any]]:
+    res = OPENAI_CLIENT.responses.create(
+        model=INTENT_MODEL,
         input=[
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": text}
-        ]
+        ],
+        text=_INTENT_FORMAT,
+        temperature=0,
+        max_output_tokens=INTENT_MAX_TOKENS,
     )
     # Extract the JSON string from the text output
     content = res.output_text.strip()
     try:
-        return json.loads(content)
+        intent = _json_loads(content)
     except Exception:
-        # If parsing fails, try rule-based
-        return simple_rule_intent(text)
+        return None
+    return intent if isinstance(intent, dict) else None
+
+
+def _llm_intents(texts: list[str]) -> list[Optional[Dict[str, Any]]]:
+    res = OPENAI_CLIENT.responses.create(
+        model=INTENT_MODEL,
+        input=[
+            {"role": "system", "content": SYSTEM_PROMPT + BATCH_PROMPT_SUFFIX},
+            {"role": "user", "content": json.dumps(texts, ensure_ascii=False)}
+        ],
+        text=_INTENTS_FORMAT,
+        temperature=0,
+        max_output_tokens=INTENT_MAX_TOKENS * len(texts),
+    )
+    try:
+        items = _json_loads(res.output_text.strip())["intents"]
+    except Exception:
+        items = None
+    if not isinstance(items, list) or len(items) != len(texts):
+        return [None] * len(texts)
+    return [item if isinstance(item, dict) else None for item in items]
+
+
+# Keywords for the rule-based fallback, scanned in one pass. Each alternative is a
+# lookahead so every occurrence is seen, even overlapping ones; the text is a plain
+# substring match, as before. Where two start at the same spot the earlier entry wins.
+_INTENT_KEYWORDS = (
+    ("normal_rate", r"normal speed|reset speed"),
+    ("rate_dec", r"slow down|decrease speed|slower"),
+    ("rate_inc", r"speed up|faster|increase speed"),
+    ("audio", r"audio"),
+    ("subtitle", r"subtitle"),
+    ("fullscreen", r"fullscreen|full screen|windowed"),
+    ("mute", r"mute"),
+    ("volume_down", r"volume down|quieter|decrease volume"),
+    ("volume_up", r"volume up|louder|increase volume"),
+    ("seek_backward", r"back|rewind"),
+    ("seek_forward", r"skip|seek|forward"),
+    ("prev", r"prev"),
+    ("next", r"next"),
+    ("cycle", r"cycle|change"),
+    ("stop", r"stop"),
+    ("play_pause", r"pause|resume|play"),
+)
+_INTENT_RE = re.compile("|".join(f"(?=(?P<{name}>{pat}))" for name, pat in _INTENT_KEYWORDS))
+
+# When several keywords appear, the first action here wins; play_pause is the default
+_ACTION_PRIORITY = (
+    "normal_rate", "rate_dec", "rate_inc", "audio_cycle", "sub_cycle", "fullscreen", "mute",
+    "volume_down", "volume_up", "seek_backward", "seek_forward", "prev", "next", "stop",
+    "play_pause",
+)
 
 
 def simple_rule_intent(text: str) -> Dict[str, Any]:
+    return rule_intent(text) or {"action": "play_pause", "notes": "fallback toggle"}
+
+
+def rule_intent(text: str) -> Optional[Dict[str, Any]]:
+    """Keyword-based intent, or None when no action keyword appears (low confidence)."""
     t = text.lower().strip()
-    # Defaults
-    intent = {"action": "play_pause", "notes": "fallback toggle"}
-
-    # Play/Pause/Stop
-    if any(x in t for x in ["pause", "play/pause", "resume", "play"]):
-        intent["action"] = "play_pause"
-    if "stop" in t:
-        intent["action"] = "stop"
-
-    # Next/Prev
-    if "next" in t:
-        intent["action"] = "next"
-    if "previous" in t or "prev" in t or "back to previous" in t:
-        intent["action"] = "prev"
-
-    # Seek
-    if "skip" in t or "seek" in t or "forward" in t:
-        intent["action"] = "seek_forward"
-        intent["value"] = extract_seconds(t) or 10
-    if "back" in t or "rewind" in t:
-        intent["action"] = "seek_backward"
+    found = {m.lastgroup for m in _INTENT_RE.finditer(t)}
+
+    # Tracks: "audio"/"subtitle" plus next/cycle/change
+    if "next" in found or "cycle" in found:
+        if "subtitle" in found:
+            found.add("sub_cycle")
+        if "audio" in found:
+            found.add("audio_cycle")
+
+    action = next((a for a in _ACTION_PRIORITY if a in found), None)
+    if action is None:
+        return None
+    intent = {"action": action, "notes": "rule-based"}
+    if action in ("seek_forward", "seek_backward"):
         intent["value"] = extract_seconds(t) or 10
-
-    # Volume
-    if "volume up" in t or "louder" in t or "increase volume" in t:
-        intent["action"] = "volume_up"
-        intent["value"] = 1
-    if "volume down" in t or "quieter" in t or "decrease volume" in t:
-        intent["action"] = "volume_down"
+    elif action in ("volume_up", "volume_down"):
         intent["value"] = 1
-    if "mute" in t or "unmute" in t:
-        intent["action"] = "mute"
-
-    # Fullscreen
-    if "fullscreen" in t or "full screen" in t or "windowed" in t:
-        intent["action"] = "fullscreen"
-
-    # Tracks
-    if "subtitle" in t and ("next" in t or "cycle" in t or "change" in t):
-        intent["action"] = "sub_cycle"
-    if "audio" in t and ("next" in t or "cycle" in t or "change" in t):
-        intent["action"] = "audio_cycle"
-
-    # Speed
-    if "speed up" in t or "faster" in t or "increase speed" in t:
-        intent["action"] = "rate_inc"
+    elif action in ("rate_inc", "rate_dec"):
         intent["value"] = 0.1
-    if "slow down" in t or "decrease speed" in t or "slower" in t:
-        intent["action"] = "rate_dec"
-        intent["value"] = 0.1
-    if "normal speed" in t or "reset speed" in t:
-        intent["action"] = "normal_rate"
-
     return intent
 
 
+# The optional unit suffix never affected the result, so only the number is matched
+_SECONDS_RE = re.compile(r"\d+")
+
+
 def extract_seconds(text: str) -> Optional[int]:
-    import re
-    m = re.search(r"(\d+)\s*(sec|secs|seconds|s)?", text)
-    if m:
-        try:
-            return int(m.group(1))
-        except:
-            return None
-    return None
+    m = _SECONDS_RE.search(text)
+    return int(m.group()) if m else None
 
 
 # -----------------------------
@@ -160,18 +417,34 @@ def extract_seconds(text: str) -> Optional[int]:
 # -----------------------------
 class MPCController:
     def __init__(self):
-        self.web_available = self._check_web()
+        # The probe result is cached for WEB_CHECK_TTL_SEC instead of re-checked
+        # on every command; the lock keeps concurrent requests to one probe.
+        self._web_lock = threading.Lock()
+        self._web_ok = False
+        self._web_checked = None
+        # MPC window handle/connection for the UI path, resolved on first use
+        self._hwnd = None
+        self._app = None
+
+    @property
+    def web_available(self) -> bool:
+        with self._web_lock:
+            now = time.monotonic()
+            if self._web_checked is None or now - self._web_checked >= WEB_CHECK_TTL_SEC:
+                self._web_ok = self._check_web()
+                self._web_checked = now
+            return self._web_ok
 
     def _check_web(self) -> bool:
         try:
-            r = requests.get(f"{MPC_BASE}/variables.html", timeout=0.5)
+            r = SESSION.get(f"{MPC_BASE}/variables.html", timeout=0.5)
             return r.status_code == 200
         except Exception:
             return False
 
     # ---- Web API path ----
     def _wm(self, cmd_id: int):
-        return requests.get(f"{MPC_BASE}/command.html", params={"wm_command": cmd_id}, timeout=1)
+        return SESSION.get(f"{MPC_BASE}/command.html", params={"wm_command": cmd_id}, timeout=1)
 
     def play_pause(self):
         if self.web_available:
@@ -209,49 +482,57 @@ class MPCController:
         else:
             self._ui_key("f")
 
+    def _set_volume_relative(self, delta: int) -> bool:
+        """Read the level once and set the target in one call; False if unsupported."""
+        try:
+            r = SESSION.get(f"{MPC_BASE}/variables.html", timeout=0.5)
+            m = _VOLUME_RE.search(r.text)
+            if not m:
+                return False
+            level = max(0, min(100, int(m.group(1)) + delta))
+            r = SESSION.get(f"{MPC_BASE}/command.html",
+                            params={"wm_command": WM_SET_VOLUME, "volume": level}, timeout=1)
+            return r.status_code == 200
+        except Exception:
+            return False
+
     def volume_up(self, steps: int = 1):
+        steps = max(1, steps)
         if self.web_available:
-            for _ in range(max(1, steps)):
-                self._wm(WM_COMMANDS["volume_up"])
+            if not self._set_volume_relative(steps * VOLUME_STEP):
+                for _ in range(steps):
+                    self._wm(WM_COMMANDS["volume_up"])
         else:
-            for _ in range(max(1, steps)):
-                self._ui_key("{UP}")
+            self._ui_key(f"{{UP {steps}}}")
 
     def volume_down(self, steps: int = 1):
+        steps = max(1, steps)
         if self.web_available:
-            for _ in range(max(1, steps)):
-                self._wm(WM_COMMANDS["volume_down"])
+            if not self._set_volume_relative(-steps * VOLUME_STEP):
+                for _ in range(steps):
+                    self._wm(WM_COMMANDS["volume_down"])
         else:
-            for _ in range(max(1, steps)):
-                self._ui_key("{DOWN}")
+            self._ui_key(f"{{DOWN {steps}}}")
 
     def seek_forward(self, seconds: int = 10):
         if self.web_available:
             # Web interface supports relative seek via /jump.html?time=+N
             try:
-                requests.get(f"{MPC_BASE}/jump.html", params={"time": f"+{max(1, seconds)}"}, timeout=1)
+                SESSION.get(f"{MPC_BASE}/jump.html", params={"time": f"+{max(1, seconds)}"}, timeout=1)
             except Exception:
-                # fallback large step via right arrow repeats
-                repeats = max(1, seconds // 5)
-                for _ in range(repeats):
-                    self._ui_key("{RIGHT}")
+                # fallback large step via right arrow repeats, sent as one key sequence
+                self._ui_key(f"{{RIGHT {max(1, seconds // 5)}}}")
         else:
-            repeats = max(1, seconds // 5)
-            for _ in range(repeats):
-                self._ui_key("{RIGHT}")
+            self._ui_key(f"{{RIGHT {max(1, seconds // 5)}}}")
 
     def seek_backward(self, seconds: int = 10):
         if self.web_available:
             try:
-                requests.get(f"{MPC_BASE}/jump.html", params={"time": f"-{max(1, seconds)}"}, timeout=1)
+                SESSION.get(f"{MPC_BASE}/jump.html", params={"time": f"-{max(1, seconds)}"}, timeout=1)
             except Exception:
-                repeats = max(1, seconds // 5)
-                for _ in range(repeats):
-                    self._ui_key("{LEFT}")
+                self._ui_key(f"{{LEFT {max(1, seconds // 5)}}}")
         else:
-            repeats = max(1, seconds // 5)
-            for _ in range(repeats):
-                self._ui_key("{LEFT}")
+            self._ui_key(f"{{LEFT {max(1, seconds // 5)}}}")
 
     def audio_cycle(self):
         if self.web_available:
@@ -289,20 +570,48 @@ class MPCController:
     # ---- UI path ----
     def _ui_key(self, key: str):
         try:
-            hwnd = find_window(title_re=r".*Media Player Classic.*")
-            app = Application(backend="uia").connect(handle=hwnd)
+            # Enumerating windows and connecting UIA is slow; only redo it when the
+            # cached window has gone away
+            if self._hwnd is None or not handleprops.iswindow(self._hwnd):
+                self._hwnd = find_window(title_re=r".*Media Player Classic.*")
+                self._app = Application(backend="uia").connect(handle=self._hwnd)
             keyboard.send_keys(key, with_spaces=True)
         except Exception:
             # If MPC window not found, try launching or just ignore
-            pass
+            self._hwnd = self._app = None
+
+
+# Shared by every request so the web probe (and its cache) isn't redone per command
+CTRL = MPCController()
+# Runs the web probe while the LLM is parsing the command
+_IO_POOL = ThreadPoolExecutor(max_workers=2)
 
 
 # -----------------------------
 # Orchestration
 # -----------------------------
 def handle_text_command(text: str) -> Dict[str, Any]:
+    ctrl = CTRL
+    # Overlap the (cached) web-availability probe with the LLM round trip
+    web_probe = _IO_POOL.submit(lambda: ctrl.web_available)
     intent = parse_intent_with_llm(text)
-    ctrl = MPCController()
+    web_probe.result()
+    execute_intent(ctrl, intent)
+    return {"ok": True, "intent": intent, "web": ctrl.web_available}
+
+
+def handle_text_commands(texts: list[str]) -> Dict[str, Any]:
+    """Run several commands in order, parsing them with a single LLM request."""
+    ctrl = CTRL
+    web_probe = _IO_POOL.submit(lambda: ctrl.web_available)
+    intents = parse_intents_with_llm(texts)
+    web_probe.result()
+    for intent in intents:
+        execute_intent(ctrl, intent)
+    return {"ok": True, "intents": intents, "web": ctrl.web_available}
+
+
+def execute_intent(ctrl: MPCController, intent: Dict[str, Any]):
     action = intent.get("action")
     value = intent.get("value")
 
@@ -341,13 +650,21 @@ def handle_text_command(text: str) -> Dict[str, Any]:
         # Fallback
         ctrl.play_pause()
 
-    return {"ok": True, "intent": intent, "web": MPCController().web_available}
-
 
 # -----------------------------
 # Flask server
 # -----------------------------
+class _OrjsonProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = _OrjsonProvider(app)
 
 @app.route("/command", methods=["POST"])
 def command():
@@ -359,6 +676,15 @@ def command():
     return jsonify(result)
 
 
+@app.route("/commands", methods=["POST"])
+def commands():
+    data = request.get_json(force=True)
+    texts = [t for t in (data.get("texts") or []) if isinstance(t, str) and t.strip()]
+    if not texts:
+        return jsonify({"ok": False, "error": "No texts"}), 400
+    return jsonify(handle_text_commands(texts))
+
+
 # -----------------------------
 # CLI mode
 # -----------------------------
@@ -382,7 +708,8 @@ def main():
                 break
     else:
         print(f"Starting server at http://{args.host}:{args.port}")
-        app.run(host=args.host, port=args.port)
+        # Each request gets its own thread, so a slow LLM call doesn't block other clients
+        app.run(host=args.host, port=args.port, threaded=True)
 
 
 if __name__ == "__main__":
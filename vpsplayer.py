@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 from dataclasses import dataclass
 from typing import Optional
 
@@ -24,6 +23,9 @@ class VideoState:
 
 
 class MP4PlayerAI(QtWidgets.QWidget):
+    # Emitted from VLC's event thread; Qt queues it onto the GUI thread
+    media_parsed = QtCore.pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MP4 Player + AI")
@@ -119,6 +121,7 @@ class MP4PlayerAI(QtWidgets.QWidget):
         self.position_slider.sliderReleased.connect(self.seek_to_slider)
         self.volume_slider.valueChanged.connect(self.change_volume)
         self.ai_btn.clicked.connect(self.ask_ai)
+        self.media_parsed.connect(self._apply_parsed)
 
         # Bind VLC video output to our frame
         if sys.platform.startswith("linux"):
@@ -147,16 +150,26 @@ class MP4PlayerAI(QtWidgets.QWidget):
 
         media = self.instance.media_new(path)
         self.state.media = media
+        self.state.duration_ms = 0
         self.player.set_media(media)
 
-        # Parse media for duration (async + fallback)
-        media.parse_with_options(vlc.MediaParseFlag.local, timeout=2_000)
-        time.sleep(0.05)  # tiny wait for metadata
-        duration = media.get_duration()
-        self.state.duration_ms = max(duration, 0)
-
+        # Start playback right away and parse in the background; seeking stays
+        # disabled until VLC reports the duration
+        self.position_slider.setEnabled(False)
+        media.event_manager().event_attach(vlc.EventType.MediaParsedChanged, self._on_parsed, media)
+        media.parse_with_options(vlc.MediaParseFlag.local | vlc.MediaParseFlag.network, timeout=-1)
         self.play()
 
+    def _on_parsed(self, event, media):
+        self.media_parsed.emit(media)
+
+    def _apply_parsed(self, media):
+        if media is not self.state.media:
+            return  # another file was opened meanwhile
+        if self.state.duration_ms <= 0:
+            self.state.duration_ms = max(media.get_duration(), 0)
+        self.position_slider.setEnabled(True)
+
     def play(self):
         if self.state.media is None:
             return
@@ -169,10 +182,12 @@ class MP4PlayerAI(QtWidgets.QWidget):
             return
         self.player.pause()
         self.state.playing = False
+        self.timer.stop()
 
     def stop(self):
         self.player.stop()
         self.state.playing = False
+        self.timer.stop()
         self.position_slider.setValue(0)
         self.time_label.setText("00:00 / 00:00")
 
@@ -199,8 +214,12 @@ class MP4PlayerAI(QtWidgets.QWidget):
             return
 
         cur_ms = self.player.get_time()
-        dur_ms = self.state.duration_ms or self.player.get_length()
-        self.state.duration_ms = max(dur_ms, self.state.duration_ms)
+        # Duration is fixed per media; only ask VLC until we have it
+        if self.state.duration_ms <= 0:
+            self.state.duration_ms = max(self.player.get_length(), 0)
+            if self.state.duration_ms > 0:
+                self.position_slider.setEnabled(True)
+        dur_ms = self.state.duration_ms
 
         # slider pos
         if dur_ms > 0:
@@ -215,7 +234,16 @@ class MP4PlayerAI(QtWidgets.QWidget):
         # stop timer when ended
         if dur_ms > 0 and cur_ms >= dur_ms and self.state.playing:
             self.stop()
-            self.timer.stop()
+
+    # The timer only runs while playing and visible
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        if self.state.playing:
+            self.timer.start()
+        super().showEvent(event)
 
     @staticmethod
     def _fmt_ms(ms: int) -> str:
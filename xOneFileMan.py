@@ -1,11 +1,43 @@
 #!/usr/bin/env python3
+import io
 import os
+import sys
 import json
+import time
 import ftplib
+import sqlite3
 import getpass
+import hashlib
+import functools
+import shutil
 import pathlib
+import queue
+import atexit
 import textwrap
+import contextlib
 import requests
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import readline  # not available on Windows
+except ImportError:
+    readline = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(obj) -> bytes:
+    """Compact UTF-8 JSON, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 # ==========================
 # CONFIG / BACKEND CONTRACT
@@ -37,11 +69,61 @@ import requests
 LLM_API_URL = "https://api.openai.com/v1/chat/completions"  # adjust if needed
 LLM_MODEL   = "gpt-4.1-mini"                                # adjust if needed
 LLM_API_KEY = os.getenv("LLM_API_KEY", "")
+# Plans are short JSON, but local_write/ftp_upload can carry file content
+LLM_MAX_TOKENS = 1024
+# prompt_cache_key is OpenAI-specific; strict compatible servers reject unknown fields
+LLM_PROMPT_CACHE_KEY = "llm-file-manager" if urlsplit(LLM_API_URL).hostname == "api.openai.com" else None
+# Print prompt-cache usage for each call
+LLM_DEBUG = bool(os.getenv("LLM_DEBUG"))
+
+# Reused across calls so each request after the first skips the TCP/TLS handshake
+_SESSION = requests.Session()
+atexit.register(_SESSION.close)
+
+# Plans for repeated queries are replayed from disk (set LLM_NO_CACHE=1 to disable)
+LLM_CACHE_PATH = os.path.expanduser("~/.llm_fm_cache.sqlite")
+LLM_CACHE_TTL_SEC = 24 * 3600
+LLM_NO_CACHE = bool(os.getenv("LLM_NO_CACHE"))
+_cache_db = None
 
 # ==========================
 # LLM CLIENT
 # ==========================
 
+def _llm_cache():
+    global _cache_db
+    if _cache_db is None:
+        _cache_db = sqlite3.connect(LLM_CACHE_PATH)
+        _cache_db.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, plan TEXT, ts INTEGER)")
+    return _cache_db
+
+
+def cached_llm(fn):
+    """Memoize plans on disk by (model, system prompt, user prompt)."""
+    @functools.wraps(fn)
+    def wrapper(system_prompt: str, user_prompt: str) -> str:
+        if LLM_NO_CACHE:
+            return fn(system_prompt, user_prompt)
+        key = hashlib.blake2b(
+            f"{LLM_MODEL}\0{system_prompt}\0{user_prompt}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        db = _llm_cache()
+        row = db.execute("SELECT plan FROM kv WHERE key = ? AND ts >= ?",
+                         (key, int(time.time()) - LLM_CACHE_TTL_SEC)).fetchone()
+        if row:
+            return row[0]
+        plan = fn(system_prompt, user_prompt)
+        try:
+            _json_loads(plan)
+        except ValueError:
+            return plan  # let execute_plan report it, but don't replay it later
+        with db:
+            db.execute("INSERT OR REPLACE INTO kv VALUES (?, ?, ?)", (key, plan, int(time.time())))
+        return plan
+    return wrapper
+
+
+@cached_llm
 def call_llm(system_prompt: str, user_prompt: str) -> str:
     if not LLM_API_KEY:
         raise RuntimeError("Set LLM_API_KEY environment variable first.")
@@ -51,19 +133,37 @@ def call_llm(system_prompt: str, user_prompt: str) -> str:
         "Content-Type": "application/json",
     }
 
+    # The system prompt is identical every turn and goes first, so the
+    # provider's automatic prefix cache can reuse it; keep dynamic text in
+    # the user message only
     payload = {
         "model": LLM_MODEL,
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user",   "content": user_prompt},
         ],
-        "temperature": 0.1,
+        "temperature": 0,
+        "max_tokens": LLM_MAX_TOKENS,
+        "response_format": {"type": "json_object"},
     }
+    if LLM_PROMPT_CACHE_KEY:
+        payload["prompt_cache_key"] = LLM_PROMPT_CACHE_KEY
 
-    resp = requests.post(LLM_API_URL, headers=headers, json=payload, timeout=60)
+    resp = _SESSION.post(LLM_API_URL, headers=headers, data=_json_dumps(payload), timeout=60)
     resp.raise_for_status()
-    data = resp.json()
-    return data["choices"][0]["message"]["content"]
+    data = _json_loads(resp.content)
+    if LLM_DEBUG:
+        usage = data.get("usage") or {}
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        print(f"[LLM usage] prompt={usage.get('prompt_tokens')} cached={cached}")
+    choice = data["choices"][0]
+    if choice.get("finish_reason") == "length":
+        # A plan cut off mid-string is invalid JSON; don't pass it on (or cache it)
+        raise RuntimeError(
+            f"LLM response hit the {LLM_MAX_TOKENS}-token output limit; "
+            "ask for smaller steps or raise LLM_MAX_TOKENS."
+        )
+    return choice["message"]["content"]
 
 
 SYSTEM_PROMPT = textwrap.dedent("""
@@ -102,6 +202,15 @@ Rules:
 # FTP CLIENT WRAPPER
 # ==========================
 
+# ftplib's default 8 KiB blocks mean a syscall (and file write) per 8 KiB
+FTP_BLOCKSIZE = 1 << 20
+# After this long idle, check the connection with NOOP before reusing it
+FTP_IDLE_CHECK_SEC = 30
+# Max concurrent FTP connections for a run of consecutive downloads
+FTP_PARALLEL = 4
+# Max concurrent file writes for a run of consecutive local_write actions
+LOCAL_WRITE_PARALLEL = 8
+
 class FTPClient:
     def __init__(self, host: str, user: str, password: str, port: int = 21):
         self.host = host
@@ -109,11 +218,33 @@ class FTPClient:
         self.password = password
         self.port = port
         self.ftp = None
+        self._last_used = 0.0
+
+    def clone(self) -> "FTPClient":
+        return FTPClient(self.host, self.user, self.password, self.port)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def connect(self):
         self.ftp = ftplib.FTP()
         self.ftp.connect(self.host, self.port, timeout=30)
         self.ftp.login(self.user, self.password)
+        self._last_used = time.monotonic()
+
+    def ensure_alive(self):
+        # One login serves every action; only reconnect if the server dropped us
+        if self.ftp and time.monotonic() - self._last_used > FTP_IDLE_CHECK_SEC:
+            try:
+                self.ftp.voidcmd("NOOP")
+            except ftplib.all_errors:
+                self.close()
+        if not self.ftp:
+            self.connect()
+        self._last_used = time.monotonic()
 
     def close(self):
         if self.ftp:
@@ -124,115 +255,197 @@ class FTPClient:
             self.ftp = None
 
     def list_dir(self, path: str = "."):
-        if not self.ftp:
-            self.connect()
+        self.ensure_alive()
         items = []
         self.ftp.retrlines(f"LIST {path}", items.append)
         return items
 
     def download_file(self, remote_path: str, local_path: str):
-        if not self.ftp:
-            self.connect()
+        self.ensure_alive()
         with open(local_path, "wb") as f:
-            self.ftp.retrbinary(f"RETR {remote_path}", f.write)
+            self.ftp.retrbinary(f"RETR {remote_path}", f.write, blocksize=FTP_BLOCKSIZE)
 
     def upload_file(self, local_path: str, remote_path: str):
-        if not self.ftp:
-            self.connect()
+        self.ensure_alive()
         with open(local_path, "rb") as f:
-            self.ftp.storbinary(f"STOR {remote_path}", f)
+            self.ftp.storbinary(f"STOR {remote_path}", f, blocksize=FTP_BLOCKSIZE)
+
+    def upload_bytes(self, data: bytes, remote_path: str):
+        self.ensure_alive()
+        self.ftp.storbinary(f"STOR {remote_path}", io.BytesIO(data), blocksize=FTP_BLOCKSIZE)
 
 
 # ==========================
 # ACTION EXECUTION
 # ==========================
 
+# Resolved working directory; nothing in the session changes it, so it is
+# computed once by main() instead of on every path check
+_BASE = None
+
+
+def set_base_dir(path: str):
+    global _BASE
+    _BASE = os.path.realpath(path)
+
+
 def safe_local_path(path: str) -> pathlib.Path:
     # Simple safety: resolve relative to current working directory
-    base = pathlib.Path.cwd()
-    p = (base / path).resolve()
-    if base not in p.parents and p != base:
+    return _resolve_local(_BASE or os.path.realpath(os.getcwd()), path)
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve_local(base: str, path: str) -> pathlib.Path:
+    # Keyed on the base too, so a different working directory never reuses
+    # another base's containment decision
+    p = os.path.realpath(os.path.join(base, path))
+    # Both sides are realpath-normalized, so a string prefix test is exact
+    if p != base and not p.startswith(base.rstrip(os.sep) + os.sep):
         raise PermissionError(f"Refusing to access path outside working dir: {p}")
+    return pathlib.Path(p)
+
+def _flush(out: list):
+    """Write buffered action output with one write() call."""
+    if out:
+        out.append("")
+        sys.stdout.write("\n".join(out))
+        out.clear()
+    sys.stdout.flush()
+
+
+def write_local(path: str, content) -> pathlib.Path:
+    p = safe_local_path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with open(p, "w", encoding="utf-8") as f:
+        f.write(content or "")
     return p
 
+
+def _copy_to_stdout(f):
+    """Send a file's raw bytes to stdout, kernel-side when possible."""
+    offset = 0
+    try:
+        out_fd = sys.stdout.fileno()
+        size = os.fstat(f.fileno()).st_size
+        while offset < size:
+            sent = os.sendfile(out_fd, f.fileno(), offset, size - offset)
+            if not sent:
+                break
+            offset += sent
+        return
+    except (AttributeError, OSError, ValueError):
+        # No sendfile on this platform, or stdout isn't a real file descriptor
+        pass
+    f.seek(offset)
+    shutil.copyfileobj(f, sys.stdout.buffer, 1 << 20)
+    sys.stdout.buffer.flush()
+
+
 def execute_action(action: dict, ftp_client: FTPClient):
+    # Output is collected per action and written once, not one print per line
+    out = []
+    try:
+        _execute_action(action, ftp_client, out)
+    finally:
+        _flush(out)
+
+
+def _h_local_list(path, content, ftp_client, out):
+    p = safe_local_path(path or ".")
+    if not p.exists():
+        out.append(f"  ! Path does not exist: {p}")
+        return
+    if p.is_dir():
+        # scandir's DirEntry knows the entry type without an extra stat()
+        # (symlinks still cost one, so linked directories keep their "/")
+        with os.scandir(p) as it:
+            out.extend(f"   {e.name} {'/' if e.is_dir() else ''}" for e in it)
+    else:
+        out.append(f"  ! Not a directory: {p}")
+
+
+def _h_local_read(path, content, ftp_client, out):
+    p = safe_local_path(path)
+    if not p.exists() or not p.is_file():
+        out.append(f"  ! File not found: {p}")
+        return
+    out.append(f"--- {p} ---")
+    _flush(out)
+    with open(p, "rb") as f:
+        _copy_to_stdout(f)
+    out.append("\n-----------")
+
+
+def _h_local_write(path, content, ftp_client, out):
+    p = write_local(path, content)
+    out.append(f"  + Wrote file: {p}")
+
+
+def _h_ftp_list(path, content, ftp_client, out):
+    items = ftp_client.list_dir(path or ".")
+    out.extend(f"   {line}" for line in items)
+
+
+def _h_ftp_download(path, content, ftp_client, out):
+    # remote path -> local file with same name in cwd
+    remote = path
+    local = safe_local_path(os.path.basename(remote))
+    ftp_client.download_file(remote, str(local))
+    out.append(f"  + Downloaded {remote} -> {local}")
+
+
+def _h_ftp_upload(path, content, ftp_client, out):
+    remote = path
+    # Inline content goes straight to the server, no temp file
+    if content is not None:
+        data = content.encode("utf-8")
+        ftp_client.upload_bytes(data, remote)
+        out.append(f"  + Uploaded {len(data)} bytes -> {remote}")
+        return
+
+    # assume remote filename matches local filename; it must exist
+    local = safe_local_path(os.path.basename(remote))
+
+    if not local.exists():
+        out.append(f"  ! Local file not found for upload: {local}")
+        return
+
+    ftp_client.upload_file(str(local), remote)
+    out.append(f"  + Uploaded {local} -> {remote}")
+
+
+_HANDLERS = {
+    "local_list": _h_local_list,
+    "local_read": _h_local_read,
+    "local_write": _h_local_write,
+    "ftp_list": _h_ftp_list,
+    "ftp_download": _h_ftp_download,
+    "ftp_upload": _h_ftp_upload,
+}
+
+
+def _execute_action(action: dict, ftp_client: FTPClient, out: list):
     atype = action.get("type")
     path  = action.get("path", "")
     content = action.get("content", None)
     notes = action.get("notes", "")
 
-    print(f"\n[Action] {atype} | path={path}")
+    out.append(f"\n[Action] {atype} | path={path}")
     if notes:
-        print(f"[Notes] {notes}")
-
-    if atype == "local_list":
-        p = safe_local_path(path or ".")
-        if not p.exists():
-            print(f"  ! Path does not exist: {p}")
-            return
-        if p.is_dir():
-            for item in p.iterdir():
-                print("  ", item.name, "/" if item.is_dir() else "")
-        else:
-            print(f"  ! Not a directory: {p}")
-
-    elif atype == "local_read":
-        p = safe_local_path(path)
-        if not p.exists() or not p.is_file():
-            print(f"  ! File not found: {p}")
-            return
-        print(f"--- {p} ---")
-        with open(p, "r", encoding="utf-8", errors="replace") as f:
-            print(f.read())
-        print("-----------")
-
-    elif atype == "local_write":
-        p = safe_local_path(path)
-        parent = p.parent
-        parent.mkdir(parents=True, exist_ok=True)
-        with open(p, "w", encoding="utf-8") as f:
-            f.write(content or "")
-        print(f"  + Wrote file: {p}")
-
-    elif atype == "ftp_list":
-        items = ftp_client.list_dir(path or ".")
-        for line in items:
-            print("  ", line)
-
-    elif atype == "ftp_download":
-        # remote path -> local file with same name in cwd
-        remote = path
-        local = safe_local_path(os.path.basename(remote))
-        ftp_client.download_file(remote, str(local))
-        print(f"  + Downloaded {remote} -> {local}")
-
-    elif atype == "ftp_upload":
-        # local file must exist; remote path is given
-        remote = path
-        # If content is provided, write to temp local file first
-        if content is not None:
-            tmp = safe_local_path(f"tmp_upload_{os.path.basename(remote)}")
-            with open(tmp, "w", encoding="utf-8") as f:
-                f.write(content)
-            local = tmp
-        else:
-            # assume remote filename matches local filename
-            local = safe_local_path(os.path.basename(remote))
-
-        if not local.exists():
-            print(f"  ! Local file not found for upload: {local}")
-            return
-
-        ftp_client.upload_file(str(local), remote)
-        print(f"  + Uploaded {local} -> {remote}")
+        out.append(f"[Notes] {notes}")
 
+    handler = _HANDLERS.get(atype) if isinstance(atype, str) else None
+    if handler is None:
+        out.append(f"  ! Unknown action type: {atype}")
+    elif ftp_client is None and atype.startswith("ftp_"):
+        out.append("  ! FTP is not configured (no host given)")
     else:
-        print(f"  ! Unknown action type: {atype}")
+        handler(path, content, ftp_client, out)
 
 
-def execute_plan(plan_json: str, ftp_client: FTPClient):
+def execute_plan(plan_json: str, ftp_client: "FTPClient | None"):
     try:
-        data = json.loads(plan_json)
+        data = _json_loads(plan_json)
     except json.JSONDecodeError as e:
         print("LLM returned invalid JSON:")
         print(plan_json)
@@ -244,17 +457,188 @@ def execute_plan(plan_json: str, ftp_client: FTPClient):
         print("Invalid plan: 'actions' is not a list.")
         return
 
-    for action in actions:
+    actions = _dedup_actions(actions)
+
+    # Connect (or revive an idle connection) once, before the first FTP action
+    if ftp_client is not None and any(
+        isinstance(a, dict) and str(a.get("type", "")).startswith("ftp_") for a in actions
+    ):
+        ftp_client.ensure_alive()
+
+    i = 0
+    while i < len(actions):
+        action = actions[i]
         if not isinstance(action, dict):
             print("Invalid action (not an object):", action)
+            i += 1
+            continue
+        # Consecutive downloads/writes to different local files don't depend
+        # on each other; overlap them. A lone action takes the plain path.
+        run = _independent_run(actions, i)
+        if run > 1:
+            _PARALLEL_RUNNERS[action["type"]](actions[i:i + run], ftp_client)
+            i += run
             continue
         execute_action(action, ftp_client)
+        i += 1
+
+
+# Actions that change files; a repeat after one of these is not a duplicate
+_MUTATING = frozenset({"local_write", "ftp_download", "ftp_upload"})
+
+
+def _dedup_actions(actions: list) -> list:
+    """Drop repeats of an earlier identical action with no file change in between."""
+    kept, seen = [], set()
+    for action in actions:
+        if not isinstance(action, dict):
+            kept.append(action)
+            continue
+        key = repr((action.get("type"), action.get("path", ""), action.get("content")))
+        if key in seen:
+            continue
+        if action.get("type") in _MUTATING:
+            seen.clear()
+        seen.add(key)
+        kept.append(action)
+    if len(kept) < len(actions):
+        print(f"Skipping {len(actions) - len(kept)} duplicate action(s).")
+    return kept
+
+
+def _local_target(action: dict) -> str:
+    """Resolved local file an action writes, so aliases of one file compare equal."""
+    path = action.get("path", "")
+    if action.get("type") == "ftp_download":
+        path = os.path.basename(path)
+    return os.path.normcase(str(safe_local_path(path)))
+
+
+def _independent_run(actions: list, i: int) -> int:
+    """Length of the run of same-type parallelizable actions starting at i."""
+    atype = actions[i].get("type")
+    if not isinstance(atype, str) or atype not in _PARALLEL_RUNNERS:
+        return 1
+    targets = set()
+    j = i
+    while j < len(actions) and isinstance(actions[j], dict) and actions[j].get("type") == atype:
+        try:
+            target = _local_target(actions[j])
+        except (OSError, TypeError, ValueError):
+            break  # let execute_action report the bad path on its own
+        if target in targets:
+            break  # a later write to the same file must wait for the earlier one
+        targets.add(target)
+        j += 1
+    return j - i
+
+
+def download_parallel(actions: list, ftp_client: FTPClient):
+    """Run several ftp_download actions over up to FTP_PARALLEL connections."""
+    if ftp_client is None:
+        for action in actions:
+            execute_action(action, ftp_client)
+        return
+
+    clients = queue.SimpleQueue()
+    clients.put(ftp_client)
+    extra = [ftp_client.clone() for _ in range(min(FTP_PARALLEL, len(actions)) - 1)]
+    for c in extra:
+        clients.put(c)
+
+    def download(action):
+        # remote path -> local file with same name in cwd
+        remote = action.get("path", "")
+        local = safe_local_path(os.path.basename(remote))
+        client = clients.get()
+        try:
+            client.download_file(remote, str(local))
+        finally:
+            clients.put(client)
+        return remote, local
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(extra) + 1) as pool:
+            futures = [pool.submit(download, a) for a in actions]
+            # Report in plan order. On the first failure, downloads that haven't
+            # started are cancelled (ones already running still finish) and the
+            # error stops the plan
+            try:
+                for action, fut in zip(actions, futures):
+                    print(f"\n[Action] ftp_download | path={action.get('path', '')}")
+                    if action.get("notes"):
+                        print(f"[Notes] {action['notes']}")
+                    remote, local = fut.result()
+                    print(f"  + Downloaded {remote} -> {local}")
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+    finally:
+        for c in extra:
+            c.close()
+
+
+def write_parallel(actions: list, ftp_client: FTPClient):
+    """Run several local_write actions (to distinct files) concurrently."""
+    with ThreadPoolExecutor(max_workers=min(LOCAL_WRITE_PARALLEL, len(actions))) as pool:
+        futures = [pool.submit(write_local, a.get("path", ""), a.get("content")) for a in actions]
+        # Report in plan order. On the first failure, writes that haven't
+        # started are cancelled (ones already running still finish) and the
+        # error stops the plan
+        try:
+            for action, fut in zip(actions, futures):
+                print(f"\n[Action] local_write | path={action.get('path', '')}")
+                if action.get("notes"):
+                    print(f"[Notes] {action['notes']}")
+                print(f"  + Wrote file: {fut.result()}")
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+
+_PARALLEL_RUNNERS = {
+    "ftp_download": download_parallel,
+    "local_write": write_parallel,
+}
 
 
 # ==========================
 # MAIN LOOP
 # ==========================
 
+HISTORY_PATH = os.path.expanduser("~/.llm_fm_history")
+HISTORY_LENGTH = 5000
+
+
+def setup_history():
+    """Persistent query history: Up recalls, Tab completes from earlier queries."""
+    if readline is None:
+        return
+    # input() already recorded the FTP host/user prompts; keep them out of the file
+    readline.clear_history()
+    try:
+        readline.read_history_file(HISTORY_PATH)
+    except (FileNotFoundError, OSError):
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+    atexit.register(readline.write_history_file, HISTORY_PATH)
+
+    def complete(text, state):
+        n = readline.get_current_history_length()
+        matches = []
+        for i in range(n, 0, -1):
+            item = readline.get_history_item(i)
+            if item and item.startswith(text) and item not in matches:
+                matches.append(item)
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.set_completer_delims("")
+    readline.parse_and_bind("tab: complete")
+
+
 def main():
     print("=== LLM File Manager with FTP ===")
     print("Natural language commands for local and FTP files.")
@@ -263,39 +647,44 @@ def main():
     ftp_host = input("FTP host (empty to skip FTP): ").strip()
     ftp_user = ""
     ftp_pass = ""
-    ftp_client = None
 
     if ftp_host:
         ftp_user = input("FTP user: ").strip()
         ftp_pass = getpass.getpass("FTP password: ")
-        ftp_client = FTPClient(ftp_host, ftp_user, ftp_pass)
 
-    while True:
-        try:
-            query = input("\n> ").strip()
-        except (EOFError, KeyboardInterrupt):
-            print("\nExiting.")
-            break
+    set_base_dir(os.getcwd())
+    setup_history()
 
-        if not query:
-            continue
-        if query.lower() in ("exit", "quit"):
-            break
+    # No action changes directory, so the prompt context is fixed for the session
+    prompt_context = f"\nCurrent working directory: {os.getcwd()}"
+    if ftp_host:
+        prompt_context += f"\nFTP host: {ftp_host}"
 
-        user_prompt = f"User request: {query}\nCurrent working directory: {os.getcwd()}"
-        if ftp_host:
-            user_prompt += f"\nFTP host: {ftp_host}"
+    # One client for the whole session: every action reuses the same login
+    session = FTPClient(ftp_host, ftp_user, ftp_pass) if ftp_host else contextlib.nullcontext()
+    with session as ftp_client:
+        while True:
+            try:
+                query = input("\n> ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print("\nExiting.")
+                break
+
+            if not query:
+                continue
+            if query.lower() in ("exit", "quit"):
+                break
+
+            user_prompt = "User request: " + query + prompt_context
+
+            try:
+                plan = call_llm(SYSTEM_PROMPT, user_prompt)
+                print("\n[LLM RAW RESPONSE]")
+                print(plan)
+                execute_plan(plan, ftp_client)
+            except Exception as e:
+                print("Error:", e)
 
-        try:
-            plan = call_llm(SYSTEM_PROMPT, user_prompt)
-            print("\n[LLM RAW RESPONSE]")
-            print(plan)
-            execute_plan(plan, ftp_client if ftp_client else FTPClient("localhost", "", ""))
-        except Exception as e:
-            print("Error:", e)
-
-    if ftp_client:
-        ftp_client.close()
     print("Bye.")
 
 if __name__ == "__main__":